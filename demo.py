@@ -15,10 +15,7 @@ This script demonstrates:
 import asyncio
 import sys
 import os
-import yaml
-import json
 from datetime import datetime
-from dotenv import load_dotenv
 
 # Set UTF-8 encoding for console output on Windows
 if sys.platform.startswith('win'):
@@ -30,6 +27,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.autogen_orchestrator import AutoGenOrchestrator
+from src.config import get_config
+from src.serialization import write_json
 from src.evaluation.judge import LLMJudge
 
 
@@ -66,12 +65,8 @@ def print_agent_message(agent, message, step=None):
 async def run_demo():
     """Run the complete end-to-end demo."""
     
-    # Load environment variables
-    load_dotenv()
-    
-    # Load configuration
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
+    # Load configuration (environment variables are loaded by src.config)
+    config = get_config()
     
     print_header("MULTI-AGENT RESEARCH SYSTEM - END-TO-END DEMO")
     print("This demo will:")
@@ -102,9 +97,24 @@ async def run_demo():
     print_header("STEP 3: MULTI-AGENT PROCESSING")
     print("Starting agent conversation...")
     print("(This may take 30-60 seconds)")
-    
-    result = orchestrator.process_query(query)
-    
+
+    # Print agent output live as it streams in
+    result = None
+    streaming_source = None
+    async for event in orchestrator.astream_query(query):
+        if event["type"] == "chunk":
+            if event["source"] != streaming_source:
+                streaming_source = event["source"]
+                print(f"\n\n{streaming_source}: ", end="")
+            print(event["content"], end="", flush=True)
+        elif event["type"] == "message":
+            if streaming_source is None:
+                print(f"  • {event['source']}: {event['kind']}")
+            streaming_source = None
+        elif event["type"] == "result":
+            result = event["result"]
+    print()
+
     # Check for errors
     if "error" in result:
         print(f"\n❌ Error: {result['error']}")
@@ -201,29 +211,6 @@ async def run_demo():
     # Create outputs directory if it doesn't exist
     Path("outputs").mkdir(exist_ok=True)
     
-    # Helper function to make objects JSON serializable
-    def make_serializable(obj):
-        """Recursively convert objects to JSON-serializable types while preserving structure."""
-        if isinstance(obj, (str, int, float, bool, type(None))):
-            return obj
-        elif isinstance(obj, dict):
-            return {k: make_serializable(v) for k, v in obj.items()}
-        elif isinstance(obj, (list, tuple)):
-            return [make_serializable(item) for item in obj]
-        elif hasattr(obj, '__dict__'):
-            # For objects with __dict__, preserve their attributes as a dict
-            obj_dict = {}
-            for key, value in obj.__dict__.items():
-                if not key.startswith('_'):  # Skip private attributes
-                    obj_dict[key] = make_serializable(value)
-            return {
-                '_type': obj.__class__.__name__,
-                **obj_dict
-            }
-        else:
-            # Last resort: convert to string representation
-            return str(obj)
-    
     # Convert conversation history to better format
     formatted_history = []
     for i, msg in enumerate(conversation_history):
@@ -251,44 +238,43 @@ async def run_demo():
             
             # Add tool calls if present
             if hasattr(msg, 'content') and hasattr(msg.content, 'tool_calls'):
-                formatted_msg["tool_calls"] = make_serializable(msg.content.tool_calls)
+                formatted_msg["tool_calls"] = msg.content.tool_calls
         
         formatted_history.append(formatted_msg)
-        formatted_history.append(formatted_msg)
     
     serializable_history = formatted_history
     
-    # Save full session
+    # Save full session (non-JSON objects are converted by the encoder)
     session_file = f"outputs/demo_session_{timestamp}.json"
-    with open(session_file, 'w') as f:
-        json.dump({
-            "query": query,
-            "timestamp": datetime.now().isoformat(),
-            "conversation_history": serializable_history,
-            "response": response_text,
-            "metadata": make_serializable(metadata),
-            "evaluation": make_serializable(evaluation)
-        }, f, indent=2)
+    await write_json(session_file, {
+        "query": query,
+        "timestamp": datetime.now().isoformat(),
+        "conversation_history": serializable_history,
+        "response": response_text,
+        "metadata": metadata,
+        "evaluation": evaluation
+    })
     
     print(f"✅ Full session saved to: {session_file}")
     
     # Save response only
     response_file = f"outputs/demo_response_{timestamp}.md"
-    with open(response_file, 'w') as f:
-        f.write(f"# Demo Response\n\n")
-        f.write(f"**Query**: {query}\n\n")
-        f.write(f"**Timestamp**: {datetime.now().isoformat()}\n\n")
-        f.write(f"---\n\n")
-        f.write(response_text)
-        f.write(f"\n\n---\n\n")
-        f.write(f"**Overall Score**: {overall_score:.3f} / 1.0\n")
+    response_md = (
+        f"# Demo Response\n\n"
+        f"**Query**: {query}\n\n"
+        f"**Timestamp**: {datetime.now().isoformat()}\n\n"
+        f"---\n\n"
+        f"{response_text}"
+        f"\n\n---\n\n"
+        f"**Overall Score**: {overall_score:.3f} / 1.0\n"
+    )
+    await asyncio.to_thread(Path(response_file).write_text, response_md, encoding="utf-8")
     
     print(f"✅ Response saved to: {response_file}")
     
     # Save judge outputs
     judge_file = f"outputs/demo_judge_{timestamp}.json"
-    with open(judge_file, 'w') as f:
-        json.dump(evaluation, f, indent=2)
+    await write_json(judge_file, evaluation)
     
     print(f"✅ Judge evaluation saved to: {judge_file}")
     
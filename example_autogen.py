@@ -8,10 +8,9 @@ Usage:
 """
 
 import os
-import yaml
 import logging
-from dotenv import load_dotenv
 from src.autogen_orchestrator import AutoGenOrchestrator
+from src.config import get_config
 
 
 def setup_logging():
@@ -28,8 +27,7 @@ def setup_logging():
 
 def load_config():
     """Load configuration from config.yaml."""
-    with open("config.yaml", "r") as f:
-        return yaml.safe_load(f)
+    return get_config()
 
 
 def print_separator(title: str = ""):
@@ -50,8 +48,7 @@ def run_single_query():
     """
     print_separator("Example 1: Single Research Query")
     
-    # Load environment and config
-    load_dotenv()
+    # Load config (environment is loaded by src.config)
     config = load_config()
     
     # Create orchestrator
@@ -64,7 +61,7 @@ def run_single_query():
     print("Processing... (this may take 1-2 minutes)\n")
     
     # Process the query
-    result = orchestrator.process_query(query, max_rounds=20)
+    result = orchestrator.process_query_sync(query, max_rounds=20)
     
     # Display results
     if "error" in result:
@@ -88,7 +85,6 @@ def run_multiple_queries():
     """
     print_separator("Example 2: Multiple Research Queries")
     
-    load_dotenv()
     config = load_config()
     
     # Create orchestrator once
@@ -107,7 +103,7 @@ def run_multiple_queries():
         print(f"\n[Query {i}/{len(queries)}] {query}")
         print("-" * 70)
         
-        result = orchestrator.process_query(query, max_rounds=15)
+        result = orchestrator.process_query_sync(query, max_rounds=15)
         results.append(result)
         
         # Print brief summary
@@ -129,7 +125,6 @@ def inspect_conversation():
     """
     print_separator("Example 3: Inspecting Conversation History")
     
-    load_dotenv()
     config = load_config()
     
     orchestrator = AutoGenOrchestrator(config)
@@ -137,7 +132,7 @@ def inspect_conversation():
     query = "What is the difference between usability and user experience?"
     
     print(f"Query: {query}\n")
-    result = orchestrator.process_query(query, max_rounds=20)
+    result = orchestrator.process_query_sync(query, max_rounds=20)
     
     if "error" in result:
         print(f"Error: {result['error']}")
@@ -166,7 +161,6 @@ def view_workflow():
     """
     print_separator("Example 4: Workflow Visualization")
     
-    load_dotenv()
     config = load_config()
     
     orchestrator = AutoGenOrchestrator(config)
@@ -188,8 +182,6 @@ def check_setup():
     """
     print_separator("Setup Check")
     
-    load_dotenv()
-    
     checks = {
         "Environment file (.env)": os.path.exists(".env"),
         "Config file (config.yaml)": os.path.exists("config.yaml"),
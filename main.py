@@ -43,17 +43,12 @@ def run_web():
 
 async def run_evaluation():
     """Run system evaluation with LLM-as-a-Judge."""
-    import yaml
-    from dotenv import load_dotenv
+    from src.config import get_config
     from src.autogen_orchestrator import AutoGenOrchestrator
     from src.evaluation.evaluator import SystemEvaluator
     
-    # Load environment variables
-    load_dotenv()
-
-    # Load config
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
+    # Load config (environment variables are loaded by src.config)
+    config = get_config()
 
     # Initialize AutoGen orchestrator
     print("Initializing AutoGen orchestrator...")
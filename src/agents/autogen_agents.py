@@ -9,6 +9,7 @@ https://microsoft.github.io/autogen/stable/user-guide/agentchat-user-guide/examp
 """
 
 import os
+import hashlib
 from typing import Dict, Any, List, Optional
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.teams import RoundRobinGroupChat
@@ -19,14 +20,51 @@ from autogen_core.models import ModelFamily
 # Import our research tools
 from src.tools.web_search import web_search
 from src.tools.paper_search import paper_search
+from src.tools.batch_search import batch_search
 
 
-def create_model_client(config: Dict[str, Any]) -> OpenAIChatCompletionClient:
+def build_shared_system_prefix(config: Dict[str, Any]) -> str:
+    """
+    Build the system prompt block shared by every agent on the team.
+
+    Each agent's system message starts with this exact text, so the first
+    tokens of every request are byte-identical across agents and providers
+    with prefix caching can reuse them instead of prefilling them again.
+
+    Args:
+        config: Configuration dictionary from config.yaml
+
+    Returns:
+        Shared system prompt prefix
+    """
+    topic = config.get("system", {}).get("topic", "the configured research topic")
+    return f"""You are one member of a four-agent research team working on: {topic}.
+
+The team works in round-robin order, one turn per agent:
+1. Planner - breaks the research query into steps and search queries
+2. Researcher - gathers evidence from web and academic sources
+3. Writer - synthesizes the evidence into a well-cited response
+4. Critic - reviews the response and ends the discussion with "TERMINATE" once it is approved
+
+Build on the earlier messages in the conversation, stay within your own role, and keep every claim traceable to a source found by the Researcher.
+
+Your role:
+"""
+
+
+def create_model_client(
+    config: Dict[str, Any],
+    prompt_cache_key: Optional[str] = None,
+    http_client=None
+) -> OpenAIChatCompletionClient:
     """
     Create model client for AutoGen agents.
     
     Args:
         config: Configuration dictionary from config.yaml
+        prompt_cache_key: Routing key for OpenAI prompt caching; requests
+            sharing a key are sent to the same cache
+        http_client: Optional shared httpx.AsyncClient (see src.http)
         
     Returns:
         OpenAIChatCompletionClient configured for the specified provider
@@ -34,6 +72,11 @@ def create_model_client(config: Dict[str, Any]) -> OpenAIChatCompletionClient:
     model_config = config.get("models", {}).get("default", {})
     provider = model_config.get("provider", "groq")
     
+    # Reuse the caller's connection pool instead of a client-private one
+    extra_args = {}
+    if http_client is not None:
+        extra_args["http_client"] = http_client
+    
     # Groq configuration (uses OpenAI-compatible API)
     if provider == "groq":
         api_key = os.getenv("GROQ_API_KEY")
@@ -48,7 +91,8 @@ def create_model_client(config: Dict[str, Any]) -> OpenAIChatCompletionClient:
                 "json_output": False,
                 "vision": False,
                 "function_calling": True,
-            }
+            },
+            **extra_args,
         )
     
     # OpenAI configuration
@@ -58,10 +102,16 @@ def create_model_client(config: Dict[str, Any]) -> OpenAIChatCompletionClient:
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment")
         
+        # OpenAI caches prompt prefixes automatically; the key keeps all
+        # agents' requests on the same cache shard
+        if prompt_cache_key:
+            extra_args["extra_body"] = {"prompt_cache_key": prompt_cache_key}
+
         return OpenAIChatCompletionClient(
             model=model_config.get("name", "gpt-4o-mini"),
             api_key=api_key,
             base_url=base_url,
+            **extra_args,
         )
 
     elif provider == "vllm":
@@ -81,13 +131,23 @@ def create_model_client(config: Dict[str, Any]) -> OpenAIChatCompletionClient:
                 "family": ModelFamily.GPT_4O,
                 "structured_output": True,
             },
+            **extra_args,
         )
     
     else:
         raise ValueError(f"Unsupported provider: {provider}")
 
 
-def create_planner_agent(config: Dict[str, Any], model_client: OpenAIChatCompletionClient) -> AssistantAgent:
+def _stream_enabled(config: Dict[str, Any]) -> bool:
+    """Whether agents should stream tokens from the model (models.default.stream)."""
+    return bool(config.get("models", {}).get("default", {}).get("stream", False))
+
+
+def create_planner_agent(
+    config: Dict[str, Any],
+    model_client: OpenAIChatCompletionClient,
+    shared_prefix: str = ""
+) -> AssistantAgent:
     """
     Create a Planner Agent using AutoGen.
     
@@ -97,6 +157,7 @@ def create_planner_agent(config: Dict[str, Any], model_client: OpenAIChatComplet
     Args:
         config: Configuration dictionary
         model_client: Model client for the agent
+        shared_prefix: Team-wide system prompt block placed before the role prompt
         
     Returns:
         AutoGen AssistantAgent configured as a planner
@@ -121,18 +182,24 @@ Be specific about what information to gather and why it's relevant."""
         system_message = custom_prompt
     else:
         system_message = default_system_message
+    system_message = shared_prefix + system_message
 
     planner = AssistantAgent(
         name="Planner",
         model_client=model_client,
         description="Breaks down research queries into actionable steps",
         system_message=system_message,
+        model_client_stream=_stream_enabled(config),
     )
     
     return planner
 
 
-def create_researcher_agent(config: Dict[str, Any], model_client: OpenAIChatCompletionClient) -> AssistantAgent:
+def create_researcher_agent(
+    config: Dict[str, Any],
+    model_client: OpenAIChatCompletionClient,
+    shared_prefix: str = ""
+) -> AssistantAgent:
     """
     Create a Researcher Agent using AutoGen.
     
@@ -142,6 +209,7 @@ def create_researcher_agent(config: Dict[str, Any], model_client: OpenAIChatComp
     Args:
         config: Configuration dictionary
         model_client: Model client for the agent
+        shared_prefix: Team-wide system prompt block placed before the role prompt
         
     Returns:
         AutoGen AssistantAgent configured as a researcher with tool access
@@ -156,7 +224,10 @@ You have access to tools for web search and paper search. When conducting resear
 2. Look for recent, high-quality sources
 3. Extract key findings, quotes, and data
 4. Note all source URLs and citations
-5. Gather evidence that directly addresses the research query"""
+5. Gather evidence that directly addresses the research query
+
+When you have several search queries, pass them all to batch_search in one call
+instead of calling web_search or paper_search once per query."""
 
     # Use custom prompt from config if available
     custom_prompt = agent_config.get("system_prompt", "")
@@ -164,12 +235,16 @@ You have access to tools for web search and paper search. When conducting resear
         system_message = custom_prompt
     else:
         system_message = default_system_message
+    system_message = shared_prefix + system_message
 
     # Wrap tools in FunctionTool
     tools = []
+    tools_config = config.get("tools", {})
+    web_search_enabled = tools_config.get("web_search", {}).get("enabled", True)
+    paper_search_enabled = tools_config.get("paper_search", {}).get("enabled", True)
     
     # Add web search tool if enabled
-    if config.get("tools", {}).get("web_search", {}).get("enabled", True):
+    if web_search_enabled:
         web_search_tool = FunctionTool(
             web_search,
             description="Search the web for articles, blog posts, and general information. Returns formatted search results with titles, URLs, and snippets."
@@ -177,13 +252,22 @@ You have access to tools for web search and paper search. When conducting resear
         tools.append(web_search_tool)
     
     # Add paper search tool if enabled
-    if config.get("tools", {}).get("paper_search", {}).get("enabled", True):
+    if paper_search_enabled:
         paper_search_tool = FunctionTool(
             paper_search,
             description="Search academic papers on Semantic Scholar. Returns papers with authors, abstracts, citation counts, and URLs. Use year_from parameter to filter recent papers."
         )
         tools.append(paper_search_tool)
 
+    # Add batch search when both sources are enabled; it runs every sub-query
+    # against both sources concurrently in a single tool call
+    if web_search_enabled and paper_search_enabled:
+        batch_search_tool = FunctionTool(
+            batch_search,
+            description="Run web and academic paper searches for several queries at once, concurrently. Pass all sub-queries from the research plan as a list. Returns results grouped by query."
+        )
+        tools.append(batch_search_tool)
+
     # Create the researcher with tool access
     researcher = AssistantAgent(
         name="Researcher",
@@ -191,12 +275,17 @@ You have access to tools for web search and paper search. When conducting resear
         tools=tools,
         description="Gathers evidence from web and academic sources using search tools",
         system_message=system_message,
+        model_client_stream=_stream_enabled(config),
     )
     
     return researcher
 
 
-def create_writer_agent(config: Dict[str, Any], model_client: OpenAIChatCompletionClient) -> AssistantAgent:
+def create_writer_agent(
+    config: Dict[str, Any],
+    model_client: OpenAIChatCompletionClient,
+    shared_prefix: str = ""
+) -> AssistantAgent:
     """
     Create a Writer Agent using AutoGen.
     
@@ -205,6 +294,7 @@ def create_writer_agent(config: Dict[str, Any], model_client: OpenAIChatCompleti
     Args:
         config: Configuration dictionary
         model_client: Model client for the agent
+        shared_prefix: Team-wide system prompt block placed before the role prompt
         
     Returns:
         AutoGen AssistantAgent configured as a writer
@@ -231,18 +321,24 @@ Format your response professionally with clear headings, paragraphs, in-text cit
         system_message = custom_prompt
     else:
         system_message = default_system_message
+    system_message = shared_prefix + system_message
 
     writer = AssistantAgent(
         name="Writer",
         model_client=model_client,
         description="Synthesizes research findings into coherent, well-cited responses",
         system_message=system_message,
+        model_client_stream=_stream_enabled(config),
     )
     
     return writer
 
 
-def create_critic_agent(config: Dict[str, Any], model_client: OpenAIChatCompletionClient) -> AssistantAgent:
+def create_critic_agent(
+    config: Dict[str, Any],
+    model_client: OpenAIChatCompletionClient,
+    shared_prefix: str = ""
+) -> AssistantAgent:
     """
     Create a Critic Agent using AutoGen.
     
@@ -252,6 +348,7 @@ def create_critic_agent(config: Dict[str, Any], model_client: OpenAIChatCompleti
     Args:
         config: Configuration dictionary
         model_client: Model client for the agent
+        shared_prefix: Team-wide system prompt block placed before the role prompt
         
     Returns:
         AutoGen AssistantAgent configured as a critic
@@ -276,35 +373,67 @@ Provide constructive but thorough feedback. End your evaluation with either "TER
         system_message = custom_prompt
     else:
         system_message = default_system_message
+    system_message = shared_prefix + system_message
 
     critic = AssistantAgent(
         name="Critic",
         model_client=model_client,
         description="Evaluates research quality and provides feedback",
         system_message=system_message,
+        model_client_stream=_stream_enabled(config),
     )
     
     return critic
 
 
-def create_research_team(config: Dict[str, Any]) -> RoundRobinGroupChat:
+def create_team_model_client(config: Dict[str, Any], http_client=None) -> OpenAIChatCompletionClient:
+    """
+    Create the model client shared by all agents of a research team.
+
+    The client is keyed for prompt caching on the team's shared system prefix.
+    It can be reused across teams running on the same event loop, which keeps
+    its HTTP connection pool alive between queries.
+
+    Args:
+        config: Configuration dictionary
+        http_client: Optional shared httpx.AsyncClient (see src.http)
+
+    Returns:
+        OpenAIChatCompletionClient for the research team
+    """
+    shared_prefix = build_shared_system_prefix(config)
+    prompt_cache_key = "research-team-" + hashlib.sha256(shared_prefix.encode("utf-8")).hexdigest()[:16]
+    return create_model_client(config, prompt_cache_key=prompt_cache_key, http_client=http_client)
+
+
+def create_research_team(
+    config: Dict[str, Any],
+    model_client: Optional[OpenAIChatCompletionClient] = None
+) -> RoundRobinGroupChat:
     """
     Create the research team as a RoundRobinGroupChat.
     
     Args:
         config: Configuration dictionary
+        model_client: Existing client to share (see create_team_model_client);
+            a new one is created if omitted
         
     Returns:
         RoundRobinGroupChat with all agents configured
     """
+    # Every agent's system message starts with the same block so providers
+    # with prefix caching only prefill it once
+    shared_prefix = build_shared_system_prefix(config)
+
     # Create model client (shared by all agents)
-    model_client = create_model_client(config)
+    if model_client is None:
+        model_client = create_team_model_client(config)
     
     # Create all agents
-    planner = create_planner_agent(config, model_client)
-    researcher = create_researcher_agent(config, model_client)
-    writer = create_writer_agent(config, model_client)
-    critic = create_critic_agent(config, model_client)
+    planner = create_planner_agent(config, model_client, shared_prefix)
+    researcher = create_researcher_agent(config, model_client, shared_prefix)
+    writer = create_writer_agent(config, model_client, shared_prefix)
+    critic = create_critic_agent(config, model_client, shared_prefix)
     
     # Create termination condition: stop on TERMINATE keyword OR after 12 messages
     # (12 messages = 3 full rounds with 4 agents)
@@ -11,14 +11,38 @@ Workflow:
 4. Critic: Evaluates quality and provides feedback
 """
 
+import atexit
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
-from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_agentchat.messages import TextMessage
+import queue
+import re
+import threading
+import weakref
+from typing import AsyncIterator, Dict, Any, Iterator, List, NamedTuple, Optional, Tuple
 
-from src.agents.autogen_agents import create_research_team
+# AutoGen is imported lazily where teams are built and run, so entry points
+# (CLI startup, --help, cached answers) don't pay for its import
 from src.guardrails.safety_manager import SafetyManager
+from src.cache import LLMResultCache
+
+
+# Phrases that indicate closing/farewell messages (not actual content)
+_CLOSING_KEYWORDS = ["thank you", "best wishes", "take care", "looking forward",
+                     "pleasure", "welcome", "glad", "hope to", "future collaboration"]
+_CLOSING_RE = re.compile("|".join(map(re.escape, _CLOSING_KEYWORDS)), re.IGNORECASE)
+
+# Numbered list items ("\n1.", "\n2.", ...) in the Researcher's tool output
+_NUM_BULLET_RE = re.compile(r"\n\d+\.")
+
+
+class _AnnotatedMessage(NamedTuple):
+    """A conversation message with the fields used to pick the final response."""
+    index: int
+    source: str
+    content: Any  # As received; tool call messages carry lists
+    text: str  # Stripped text content, "" for non-text messages
+    length: int
+    is_farewell: bool  # Short closing message ("thank you", ...)
 
 
 class AutoGenOrchestrator:
@@ -43,19 +67,38 @@ class AutoGenOrchestrator:
         # Initialize safety manager
         self.safety_manager = SafetyManager(config)
         
-        # Don't create team here - will create fresh for each query
-        # to avoid event loop conflicts
-        self.team = None
+        # Cache of final results for repeated / near-duplicate queries
+        self.cache = LLMResultCache(config)
+        
+        # Teams and their model client are bound to the event loop they first
+        # ran on, so they are pooled per loop and reused across queries
+        # (reset between runs). Concurrent queries on one loop each take
+        # their own team from the pool.
+        self._team_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        
+        # Persistent loop for process_query_sync, run on its own thread so
+        # sync callers reuse teams too, including several threads sharing
+        # one orchestrator (e.g. Streamlit sessions)
+        self._sync_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_loop_lock = threading.Lock()
         
         self.logger.info("AutoGen orchestrator initialized")
         
         # Workflow trace for debugging and UI display
         self.workflow_trace: List[Dict[str, Any]] = []
 
-    def process_query(self, query: str, max_rounds: int = 10) -> Dict[str, Any]:
+    async def process_query(self, query: str, max_rounds: int = 10) -> Dict[str, Any]:
         """
         Process a research query through the multi-agent system.
 
+        This is a coroutine so that several queries can share one event loop
+        (e.g. batched evaluation with asyncio.gather). Synchronous callers
+        should use process_query_sync(); callers that want to show progress
+        while the agents are working should use astream_query() (or
+        stream_query_sync()).
+
         Args:
             query: The research question to answer
             max_rounds: Maximum number of conversation rounds
@@ -67,6 +110,31 @@ class AutoGenOrchestrator:
             - conversation_history: Full conversation between agents
             - metadata: Additional information about the process
         """
+        result = None
+        async for event in self.astream_query(query, max_rounds):
+            if event["type"] == "result":
+                result = event["result"]
+        return result
+
+    async def astream_query(self, query: str, max_rounds: int = 10) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a research query, yielding events as the agents produce them.
+
+        Events are dictionaries with a "type" key:
+        - "chunk": a streamed token fragment ("source", "content"); only
+          emitted when models.default.stream is enabled
+        - "message": a complete agent message, tool call or tool result
+          ("source", "kind", "content")
+        - "result": always the last event; "result" holds the same dictionary
+          process_query() returns
+
+        Args:
+            query: The research question to answer
+            max_rounds: Maximum number of conversation rounds
+
+        Yields:
+            Event dictionaries
+        """
         self.logger.info(f"Processing query: {query}")
         
         # Check input safety
@@ -75,33 +143,30 @@ class AutoGenOrchestrator:
             violations = safety_check.get("violations", [])
             violation_msg = "; ".join([v.get("reason", "Unknown") for v in violations])
             self.logger.warning(f"Query blocked by safety guardrails: {violation_msg}")
-            return {
+            yield {"type": "result", "result": {
                 "query": query,
                 "error": "Safety violation",
                 "response": f"This query violates safety policies: {violation_msg}",
                 "conversation_history": [],
                 "metadata": {"safety_blocked": True, "reason": violation_msg}
-            }
+            }}
+            return
+        
+        # Serve repeated queries from the result cache. SQLite and the
+        # embedding model (loaded on first use) block, so they run off the
+        # event loop rather than stalling concurrent queries
+        cached = await asyncio.to_thread(self.cache.lookup, query)
+        if cached is not None:
+            yield {"type": "result", "result": cached}
+            return
         
         try:
-            # Always use asyncio.run() in a new thread to avoid event loop conflicts
-            # This ensures AutoGen's internal queues are created in the correct loop
-            import nest_asyncio
-            import concurrent.futures
-            
-            def run_async_in_new_loop():
-                # Apply nest_asyncio to allow nested loops
-                nest_asyncio.apply()
-                # Create new event loop for this thread
-                new_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(new_loop)
-                try:
-                    return new_loop.run_until_complete(self._process_query_async(query, max_rounds))
-                finally:
-                    new_loop.close()
-            
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                result = pool.submit(run_async_in_new_loop).result()
+            result = None
+            async for event in self._stream_team_async(query, max_rounds):
+                if event["type"] == "result":
+                    result = event["result"]
+                else:
+                    yield event
             
             # Check output safety
             response_text = result.get("response", "")
@@ -115,33 +180,161 @@ class AutoGenOrchestrator:
                 result["metadata"]["safety_sanitized"] = True
                 result["metadata"]["safety_violations"] = violations
             
+            await asyncio.to_thread(self.cache.update, query, result)
+            
             self.logger.info("Query processing complete")
-            return result
             
         except Exception as e:
             self.logger.error(f"Error processing query: {e}", exc_info=True)
-            return {
+            result = {
                 "query": query,
                 "error": str(e),
                 "response": f"An error occurred while processing your query: {str(e)}",
                 "conversation_history": [],
                 "metadata": {"error": True}
             }
+        
+        yield {"type": "result", "result": result}
+
+    def process_query_sync(self, query: str, max_rounds: int = 10) -> Dict[str, Any]:
+        """
+        Synchronous shim around process_query() for callers without an event loop
+        (CLI, Streamlit, example scripts). Safe to call from several threads at
+        once; the queries then run concurrently, each with its own team.
+
+        Args:
+            query: The research question to answer
+            max_rounds: Maximum number of conversation rounds
+
+        Returns:
+            Same dictionary as process_query()
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.process_query(query, max_rounds), self._get_sync_loop()
+        )
+        return future.result()
     
-    async def _process_query_async(self, query: str, max_rounds: int = 10) -> Dict[str, Any]:
+    def stream_query_sync(self, query: str, max_rounds: int = 10) -> Iterator[Dict[str, Any]]:
         """
-        Async implementation of query processing.
+        Synchronous counterpart of astream_query() for callers without an event
+        loop that want to show progress (e.g. Streamlit). The query runs on the
+        process_query_sync loop; closing the generator early cancels it.
+
+        Args:
+            query: The research question to answer
+            max_rounds: Maximum number of conversation rounds
+
+        Yields:
+            Same events as astream_query()
+        """
+        events: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+
+        async def forward():
+            try:
+                async for event in self.astream_query(query, max_rounds):
+                    events.put(event)
+            finally:
+                events.put(None)
+
+        future = asyncio.run_coroutine_threadsafe(forward(), self._get_sync_loop())
+        try:
+            while True:
+                event = events.get()
+                if event is None:
+                    break
+                yield event
+            future.result()  # re-raise anything that ended the stream early
+        finally:
+            if not future.done():
+                future.cancel()
+    
+    def _get_sync_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the process_query_sync event loop, starting its thread on first use."""
+        with self._sync_loop_lock:
+            if self._sync_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name="orchestrator-loop",
+                    daemon=True
+                ).start()
+                self._sync_loop = loop
+                atexit.register(self.close)
+            return self._sync_loop
+    
+    def close(self):
+        """
+        Close the shared HTTP client of the process_query_sync loop and stop
+        the loop. Registered with atexit when the loop is started; a later
+        process_query_sync call starts a new loop.
+        """
+        with self._sync_loop_lock:
+            loop, self._sync_loop = self._sync_loop, None
+        if loop is None:
+            return
+        
+        try:
+            from src.http import aclose_http_client
+            asyncio.run_coroutine_threadsafe(aclose_http_client(), loop).result(timeout=5)
+        except Exception as e:
+            self.logger.warning(f"Could not close HTTP client: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+    
+    async def _acquire_team(self):
+        """
+        Take an idle research team for the running event loop, creating one if needed.
+        
+        Returns:
+            RoundRobinGroupChat ready to run
+        """
+        from src.agents.autogen_agents import create_research_team, create_team_model_client
+        from src.http import get_http_client
+        
+        loop = asyncio.get_running_loop()
+        pool = self._team_pools.get(loop)
+        if pool is None:
+            pool = {
+                "model_client": create_team_model_client(self.config, http_client=get_http_client()),
+                "idle": []
+            }
+            self._team_pools[loop] = pool
+        
+        if pool["idle"]:
+            return pool["idle"].pop()
+        
+        self.logger.info("Creating research team...")
+        return create_research_team(self.config, model_client=pool["model_client"])
+    
+    async def _release_team(self, team):
+        """
+        Reset a team after a run and return it to its loop's pool.
+        
+        Args:
+            team: Team previously returned by _acquire_team()
+        """
+        try:
+            await team.reset()
+        except Exception as e:
+            # e.g. the run was cancelled mid-way; build a new team next time
+            self.logger.warning(f"Discarding research team that could not be reset: {e}")
+            return
+        self._team_pools[asyncio.get_running_loop()]["idle"].append(team)
+    
+    async def _stream_team_async(self, query: str, max_rounds: int = 10) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the research team, forwarding its events as they arrive.
         
         Args:
             query: The research question to answer
             max_rounds: Maximum number of conversation rounds
             
-        Returns:
-            Dictionary containing results
+        Yields:
+            "chunk" and "message" events, then a final "result" event
         """
-        # Create a fresh team for this query to avoid event loop conflicts
-        self.logger.info("Creating fresh research team for this query...")
-        team = create_research_team(self.config)
+        from autogen_agentchat.base import TaskResult
+        from autogen_agentchat.messages import ModelClientStreamingChunkEvent
+        
+        team = await self._acquire_team()
         
         # Create task message
         task_message = f"""Research Query: {query}
@@ -152,64 +345,105 @@ Please work together to answer this query comprehensively:
 3. Writer: Synthesize findings into a well-cited response
 4. Critic: Evaluate the quality and provide feedback"""
         
-        # Run the team
-        result = await team.run(task=task_message)
-        
-        # Extract conversation history
+        # Run the team, collecting the conversation history as it streams
         messages = []
-        for message in result.messages:
-            msg_dict = {
-                "source": message.source,
-                "content": message.content if hasattr(message, 'content') else str(message),
-            }
-            messages.append(msg_dict)
-        
-        # Extract final response - get Writer's substantive research answer
-        final_response = ""
+        try:
+            async for event in team.run_stream(task=task_message):
+                if isinstance(event, TaskResult):
+                    continue
+                if isinstance(event, ModelClientStreamingChunkEvent):
+                    yield {"type": "chunk", "source": event.source, "content": event.content}
+                    continue
+                
+                msg_dict = {
+                    "source": event.source,
+                    "content": event.content if hasattr(event, 'content') else str(event),
+                }
+                messages.append(msg_dict)
+                yield {"type": "message", "kind": type(event).__name__, **msg_dict}
+        finally:
+            await self._release_team(team)
         
-        # Keywords that indicate closing/farewell messages (not actual content)
-        closing_keywords = ["thank you", "best wishes", "take care", "looking forward", 
-                           "pleasure", "welcome", "glad", "hope to", "future collaboration"]
+        annotated, by_source = self._annotate_messages(messages)
+        final_response = self._select_final_response(annotated, by_source)
+        yield {"type": "result", "result": self._extract_results(query, messages, final_response, by_source)}
+
+    def _annotate_messages(
+        self,
+        messages: List[Dict[str, Any]]
+    ) -> Tuple[List[_AnnotatedMessage], Dict[str, List[_AnnotatedMessage]]]:
+        """
+        Annotate every message once for response selection and result extraction.
+
+        Args:
+            messages: List of conversation messages
+
+        Returns:
+            Tuple of (annotated messages in order, annotated messages grouped by source)
+        """
+        annotated = []
+        by_source: Dict[str, List[_AnnotatedMessage]] = {}
         
-        if messages:
-            # Get Writer's responses, excluding farewell messages
-            writer_responses = []
-            for msg in reversed(messages):
-                if msg.get("source") == "Writer":
-                    content = msg.get("content", "").strip()
-                    # Check if this is substantive content (not just a closing message)
-                    content_lower = content.lower()
-                    is_closing = any(keyword in content_lower for keyword in closing_keywords)
-                    is_short = len(content) < 200  # Substantive answers are usually longer
-                    
-                    # Skip if it's a short closing message
-                    if not (is_closing and is_short):
-                        writer_responses.append(content)
-            
-            # Use the longest substantive Writer response (likely the main answer)
-            if writer_responses:
-                final_response = max(writer_responses, key=len)
+        for i, msg in enumerate(messages):
+            source = msg.get("source", "")
+            content = msg.get("content", "")
+            text = content.strip() if isinstance(content, str) else ""
+            length = len(text)
+            # Only short messages can be farewells (substantive answers are longer)
+            is_farewell = length < 200 and bool(_CLOSING_RE.search(text))
             
-            # If no Writer response found, fall back to any substantive agent message
-            if not final_response:
-                for msg in reversed(messages):
-                    if msg.get("source") not in ["User", "user"]:
-                        content = msg.get("content", "").strip()
-                        if len(content) > 200:  # Substantive content threshold
-                            final_response = content
-                            break
+            entry = _AnnotatedMessage(i, source, content, text, length, is_farewell)
+            annotated.append(entry)
+            by_source.setdefault(source, []).append(entry)
+        
+        return annotated, by_source
+
+    def _select_final_response(
+        self,
+        annotated: List[_AnnotatedMessage],
+        by_source: Dict[str, List[_AnnotatedMessage]]
+    ) -> str:
+        """
+        Pick the Writer's substantive research answer from the conversation.
+
+        Args:
+            annotated: Annotated messages in conversation order
+            by_source: Annotated messages grouped by source
+
+        Returns:
+            Final response text
+        """
+        # Use the longest Writer response that isn't a short closing message
+        # (likely the main answer); on ties the latest one wins
+        writer_response = max(
+            (a for a in reversed(by_source.get("Writer", [])) if not a.is_farewell),
+            key=lambda a: a.length,
+            default=None
+        )
+        if writer_response is not None and writer_response.text:
+            return writer_response.text
+        
+        agent_messages = [a for a in reversed(annotated) if a.source not in ["User", "user"]]
+        
+        # If no Writer response found, fall back to any substantive agent message
+        for a in agent_messages:
+            if a.length > 200:  # Substantive content threshold
+                return a.text
         
         # If still no response found, use the last non-user message
-        if not final_response and messages:
-            for msg in reversed(messages):
-                if msg.get("source") not in ["User", "user"]:
-                    final_response = msg.get("content", "")
-                    if final_response:
-                        break
+        for a in agent_messages:
+            if a.text:
+                return a.text
         
-        return self._extract_results(query, messages, final_response)
+        return ""
 
-    def _extract_results(self, query: str, messages: List[Dict[str, Any]], final_response: str = "") -> Dict[str, Any]:
+    def _extract_results(
+        self,
+        query: str,
+        messages: List[Dict[str, Any]],
+        final_response: str = "",
+        by_source: Optional[Dict[str, List[_AnnotatedMessage]]] = None
+    ) -> Dict[str, Any]:
         """
         Extract structured results from the conversation history.
 
@@ -217,33 +451,27 @@ Please work together to answer this query comprehensively:
             query: Original query
             messages: List of conversation messages
             final_response: Final response from the team
+            by_source: Annotated messages grouped by source (computed if omitted)
 
         Returns:
             Structured result dictionary
         """
-        # Extract components from conversation
-        research_findings = []
-        plan = ""
-        critique = ""
+        if by_source is None:
+            _, by_source = self._annotate_messages(messages)
         
-        for msg in messages:
-            source = msg.get("source", "")
-            content = msg.get("content", "")
-            
-            if source == "Planner" and not plan:
-                plan = content
-            
-            elif source == "Researcher":
-                research_findings.append(content)
-            
-            elif source == "Critic":
-                critique = content
+        # Extract components from conversation
+        plan = next((a.content for a in by_source.get("Planner", []) if a.content), "")
+        research_findings = [a.content for a in by_source.get("Researcher", [])]
+        critics = by_source.get("Critic", [])
+        critique = critics[-1].content if critics else ""
         
         # Count sources mentioned in research
         num_sources = 0
         for finding in research_findings:
-            # Rough count of sources based on numbered results
-            num_sources += finding.count("\n1.") + finding.count("\n2.") + finding.count("\n3.")
+            # Rough count of sources based on numbered results; tool call
+            # messages carry lists rather than text and are skipped
+            if isinstance(finding, str):
+                num_sources += sum(1 for _ in _NUM_BULLET_RE.finditer(finding))
         
         # Clean up final response
         if final_response:
@@ -259,7 +487,7 @@ Please work together to answer this query comprehensively:
                 "plan": plan,
                 "research_findings": research_findings,
                 "critique": critique,
-                "agents_involved": list(set([msg.get("source", "") for msg in messages])),
+                "agents_involved": list(by_source),
             }
         }
 
@@ -323,15 +551,10 @@ def demonstrate_usage():
     
     This function shows a simple example of using the orchestrator.
     """
-    import yaml
-    from dotenv import load_dotenv
-    
-    # Load environment variables
-    load_dotenv()
+    from src.config import get_config
     
-    # Load configuration
-    with open("config.yaml", "r") as f:
-        config = yaml.safe_load(f)
+    # Load configuration (environment variables are loaded by src.config)
+    config = get_config()
     
     # Create orchestrator
     orchestrator = AutoGenOrchestrator(config)
@@ -346,7 +569,7 @@ def demonstrate_usage():
     print("=" * 70)
     
     # Process query
-    result = orchestrator.process_query(query)
+    result = orchestrator.process_query_sync(query)
     
     # Display results
     print("\n" + "=" * 70)
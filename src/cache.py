@@ -0,0 +1,297 @@
+"""
+Research Result Cache
+Caches final orchestrator results so repeated queries skip the agent team.
+
+Two tiers, following the lookup/update API of LangChain's BaseCache:
+1. Exact: SHA256(llm_string + query) -> full result JSON, stored in SQLite
+2. Semantic: sentence embedding of the query; a cached query whose cosine
+   similarity exceeds the configured threshold is treated as a hit
+
+llm_string fingerprints the model, agent and tool settings from config.yaml,
+so changing the model, temperature or prompts invalidates old entries.
+The semantic tier needs sentence-transformers; without it only exact
+matching is used.
+"""
+
+from typing import Dict, Any, List, Optional
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+
+class LLMResultCache:
+    """
+    SQLite-backed cache of research results with optional semantic lookup.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the cache.
+
+        Args:
+            config: Configuration dictionary from config.yaml
+        """
+        cache_config = config.get("cache", {})
+        self.logger = logging.getLogger("cache")
+
+        self.enabled = cache_config.get("enabled", True)
+        self.path = cache_config.get("path", ".cache/results.sqlite")
+        # 0 or None disables expiry
+        self.ttl_seconds = cache_config.get("ttl_seconds", 86400)
+
+        semantic_config = cache_config.get("semantic", {})
+        self.semantic_enabled = semantic_config.get("enabled", True)
+        self.semantic_model_name = semantic_config.get(
+            "model", "sentence-transformers/all-MiniLM-L6-v2"
+        )
+        self.similarity_threshold = semantic_config.get("threshold", 0.95)
+
+        self.llm_string = self._fingerprint(config)
+
+        # lookup()/update() may run concurrently on worker threads (the
+        # orchestrator calls them via asyncio.to_thread, and it may be shared
+        # by Streamlit sessions): _lock guards the connection and the
+        # in-memory semantic index, _index_lock the one-time model load
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        # Semantic index (loaded lazily on first use)
+        self._embedder = None
+        self._semantic_keys: List[str] = []
+        self._semantic_matrix = None
+        self._semantic_loaded = False
+        # lookup() embeds a query and update() embeds the same query after
+        # the team run, so recent embeddings are memoized per instance
+        self._encode_cached = lru_cache(maxsize=128)(self._encode)
+
+        if self.enabled:
+            try:
+                self._connect()
+            except Exception as e:
+                self.logger.error(f"Could not open result cache at {self.path}: {e}")
+                self.enabled = False
+
+        self.logger.info(f"Result cache initialized (enabled={self.enabled})")
+
+    def lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result for a query.
+
+        Args:
+            query: The research query
+
+        Returns:
+            Cached result dictionary, or None on a miss. The metadata of a hit
+            carries "cache_hit": "exact" or "semantic".
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT result FROM results WHERE key = ? AND created_at >= ?",
+                    (self._key(query), self._min_created_at())
+                ).fetchone()
+            if row:
+                self.logger.info("Result cache hit (exact)")
+                return self._as_hit(row[0], query, "exact")
+
+            key = self._semantic_lookup(query)
+            if key:
+                with self._lock:
+                    row = self._conn.execute(
+                        "SELECT result FROM results WHERE key = ? AND created_at >= ?",
+                        (key, self._min_created_at())
+                    ).fetchone()
+                if row:
+                    self.logger.info("Result cache hit (semantic)")
+                    return self._as_hit(row[0], query, "semantic")
+        except Exception as e:
+            self.logger.warning(f"Result cache lookup failed: {e}")
+
+        return None
+
+    def update(self, query: str, result: Dict[str, Any]):
+        """
+        Store the result for a query.
+
+        Args:
+            query: The research query
+            result: Result dictionary from the orchestrator
+        """
+        if not self.enabled:
+            return
+
+        try:
+            key = self._key(query)
+            embedding = self._embed(query)
+            payload = json.dumps(result, default=str)
+            blob = embedding.tobytes() if embedding is not None else None
+
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results "
+                    "(key, llm_string, query, result, embedding, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, self.llm_string, query, payload, blob, time.time())
+                )
+                self._conn.commit()
+
+            if embedding is not None and self._semantic_loaded:
+                self._add_to_index(key, embedding)
+        except Exception as e:
+            self.logger.warning(f"Result cache update failed: {e}")
+
+    def clear(self):
+        """Remove all cached results."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+            self._semantic_keys = []
+            self._semantic_matrix = None
+
+    def _connect(self):
+        """Open the SQLite database and drop expired entries."""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # The orchestrator may be driven from Streamlit worker threads
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, llm_string TEXT, query TEXT, result TEXT, "
+            "embedding BLOB, created_at REAL)"
+        )
+        self._conn.execute(
+            "DELETE FROM results WHERE created_at < ?", (self._min_created_at(),)
+        )
+        self._conn.commit()
+
+    def _key(self, query: str) -> str:
+        """Exact-match key for a query under the current configuration."""
+        return hashlib.sha256(f"{self.llm_string}\x00{query}".encode("utf-8")).hexdigest()
+
+    def _min_created_at(self) -> float:
+        """Oldest creation time that is still within the TTL."""
+        if not self.ttl_seconds:
+            return 0.0
+        return time.time() - self.ttl_seconds
+
+    def _as_hit(self, payload: str, query: str, hit_type: str) -> Dict[str, Any]:
+        """Rebuild a cached result for the query that hit it."""
+        result = json.loads(payload)
+        result["query"] = query
+        result.setdefault("metadata", {})["cache_hit"] = hit_type
+        return result
+
+    def _semantic_lookup(self, query: str) -> Optional[str]:
+        """Return the key of the most similar cached query above the threshold."""
+        if not self.semantic_enabled:
+            return None
+        self._load_semantic_index()
+        with self._lock:
+            # The matrix is replaced, never modified, and keys only grow, so
+            # this snapshot stays consistent after the lock is released
+            matrix, keys = self._semantic_matrix, self._semantic_keys
+        if matrix is None or not keys:
+            return None
+
+        embedding = self._embed(query)
+        if embedding is None:
+            return None
+
+        # Embeddings are normalized, so the dot product is the cosine similarity
+        similarities = matrix @ embedding
+        best = int(similarities.argmax())
+        if similarities[best] >= self.similarity_threshold:
+            return keys[best]
+        return None
+
+    def _load_semantic_index(self):
+        """Load the embedding model and the stored embeddings into memory."""
+        if self._semantic_loaded:
+            return
+        with self._index_lock:
+            if self._semantic_loaded:
+                return
+            try:
+                self._load_semantic_index_locked()
+            finally:
+                self._semantic_loaded = True
+
+    def _load_semantic_index_locked(self):
+        """Body of _load_semantic_index; called once, holding _index_lock."""
+        try:
+            import numpy as np
+            from sentence_transformers import SentenceTransformer
+
+            self._embedder = SentenceTransformer(self.semantic_model_name)
+        except ImportError:
+            self.logger.info("sentence-transformers not available, semantic cache disabled")
+            self.semantic_enabled = False
+            return
+        except Exception as e:
+            self.logger.warning(f"Could not load embedding model: {e}")
+            self.semantic_enabled = False
+            return
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, embedding FROM results "
+                "WHERE llm_string = ? AND embedding IS NOT NULL AND created_at >= ?",
+                (self.llm_string, self._min_created_at())
+            ).fetchall()
+
+        for key, blob in rows:
+            self._add_to_index(key, np.frombuffer(blob, dtype=np.float32))
+
+    def _add_to_index(self, key: str, embedding):
+        """Append one embedding to the in-memory semantic index."""
+        import numpy as np
+
+        row = embedding.reshape(1, -1)
+        with self._lock:
+            if self._semantic_matrix is None:
+                self._semantic_matrix = row
+            else:
+                self._semantic_matrix = np.vstack([self._semantic_matrix, row])
+            self._semantic_keys.append(key)
+
+    def _embed(self, query: str):
+        """
+        Normalized float32 embedding of a query, or None without a model.
+        Memoized, so callers must not modify the returned array.
+        """
+        if not self.semantic_enabled:
+            return None
+        self._load_semantic_index()
+        if self._embedder is None:
+            return None
+
+        return self._encode_cached(query)
+
+    def _encode(self, query: str):
+        """Run the embedding model on a query; memoized by _embed."""
+        import numpy as np
+
+        embedding = self._embedder.encode(query, normalize_embeddings=True)
+        return np.asarray(embedding, dtype=np.float32)
+
+    @staticmethod
+    def _fingerprint(config: Dict[str, Any]) -> str:
+        """Hash of the settings that change what the agents generate."""
+        relevant = {
+            "models": config.get("models", {}).get("default", {}),
+            "agents": config.get("agents", {}),
+            "tools": config.get("tools", {}),
+        }
+        return hashlib.sha256(
+            json.dumps(relevant, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
@@ -0,0 +1,48 @@
+"""
+Configuration Loading
+Loads config.yaml (again only when it changes) and the .env file once per process.
+
+Example usage:
+    from src.config import get_config
+    config = get_config()
+"""
+
+from typing import Dict, Any
+from functools import lru_cache
+import os
+import yaml
+from dotenv import load_dotenv
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+
+# Load environment variables (API keys) once, on first import
+load_dotenv()
+
+
+def get_config(path: str = "config.yaml") -> Dict[str, Any]:
+    """
+    Load and parse a configuration file, memoized per path.
+
+    The file is parsed again only when its modification time changes, and
+    the same dictionary is returned otherwise, so callers should not modify
+    it in place.
+
+    Args:
+        path: Path to the YAML configuration file
+
+    Returns:
+        Configuration dictionary
+    """
+    return _load_config(path, os.path.getmtime(path))
+
+
+@lru_cache(maxsize=4)
+def _load_config(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a configuration file; mtime is only part of the cache key."""
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=_SafeLoader)
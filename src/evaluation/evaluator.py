@@ -4,8 +4,7 @@ Runs batch evaluations and generates reports.
 
 Example usage:
     # Load config
-    with open("config.yaml") as f:
-        config = yaml.safe_load(f)
+    config = get_config()
     
     # Initialize evaluator with orchestrator
     evaluator = SystemEvaluator(config, orchestrator=my_orchestrator)
@@ -16,7 +15,7 @@ Example usage:
     # Results are automatically saved to outputs/
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import json
 import logging
 from pathlib import Path
@@ -24,6 +23,7 @@ from datetime import datetime
 import asyncio
 
 from .judge import LLMJudge
+from src.serialization import loads
 
 
 class SystemEvaluator:
@@ -54,6 +54,8 @@ class SystemEvaluator:
         eval_config = config.get("evaluation", {})
         self.enabled = eval_config.get("enabled", True)
         self.max_test_queries = eval_config.get("num_test_queries", None)
+        # Number of test queries run through the orchestrator at the same time
+        self.concurrency = max(1, int(eval_config.get("concurrency", 16)))
         
         # Initialize judge (passes config to load judge model settings and criteria)
         self.judge = LLMJudge(config)
@@ -94,19 +96,45 @@ class SystemEvaluator:
         test_queries = self._load_test_queries(test_queries_path)
         self.logger.info(f"Loaded {len(test_queries)} test queries")
 
-        # Evaluate each query
-        for i, test_case in enumerate(test_queries, 1):
-            self.logger.info(f"Evaluating query {i}/{len(test_queries)}")
+        # Run each distinct test case once; repeats of a query (ignoring case
+        # and whitespace) with the same ground truth share its result
+        unique_cases: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        case_keys = []
+        for test_case in test_queries:
+            key = self._dedup_key(test_case)
+            unique_cases.setdefault(key, test_case)
+            case_keys.append(key)
+        if len(unique_cases) < len(test_queries):
+            self.logger.info(
+                f"Skipping {len(test_queries) - len(unique_cases)} duplicate test queries"
+            )
+
+        # Evaluate queries concurrently; the semaphore bounds in-flight queries
+        # to respect provider rate limits
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _evaluate_bounded(i: int, test_case: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                self.logger.info(f"Evaluating query {i}/{len(unique_cases)}")
+                return await self._evaluate_query(test_case)
+
+        outcomes = await asyncio.gather(
+            *[_evaluate_bounded(i, tc) for i, tc in enumerate(unique_cases.values(), 1)],
+            return_exceptions=True
+        )
+        outcome_by_key = dict(zip(unique_cases, outcomes))
 
-            try:
-                result = await self._evaluate_query(test_case)
-                self.results.append(result)
-            except Exception as e:
-                self.logger.error(f"Error evaluating query {i}: {e}")
+        # Results keep the order of the test query file, one per entry
+        for i, (test_case, key) in enumerate(zip(test_queries, case_keys), 1):
+            outcome = outcome_by_key[key]
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Error evaluating query {i}: {outcome}")
                 self.results.append({
                     "query": test_case.get("query", ""),
-                    "error": str(e)
+                    "error": str(outcome)
                 })
+            else:
+                self.results.append({**outcome, "query": test_case.get("query", "")})
 
         # Aggregate results
         report = self._generate_report()
@@ -116,6 +144,11 @@ class SystemEvaluator:
 
         return report
 
+    def _dedup_key(self, test_case: Dict[str, Any]) -> Tuple[str, str]:
+        """Key under which identical test cases are evaluated only once."""
+        query = " ".join(test_case.get("query", "").lower().split())
+        return query, str(test_case.get("ground_truth"))
+
     async def _evaluate_query(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
         """
         Evaluate a single test query.
@@ -135,13 +168,8 @@ class SystemEvaluator:
         # Run through orchestrator if available
         if self.orchestrator:
             try:
-                # Call orchestrator's process_query method
-                # TODO: YOUR CODE HERE
-                # Need to implement this in their orchestrator
-                response_data = self.orchestrator.process_query(query)
-                
-                # If process_query is async, use:
-                # response_data = await self.orchestrator.process_query(query)
+                # process_query is a coroutine, so it runs on the evaluator's loop
+                response_data = await self.orchestrator.process_query(query)
                 
             except Exception as e:
                 self.logger.error(f"Error processing query through orchestrator: {e}")
@@ -211,8 +239,7 @@ class SystemEvaluator:
             self.logger.warning(f"Test queries file not found: {path}")
             return []
 
-        with open(path_obj, 'r') as f:
-            queries = json.load(f)
+        queries = loads(path_obj.read_bytes())
 
         # Limit number of queries if configured in config.yaml
         if self.max_test_queries and len(queries) > self.max_test_queries:
@@ -381,18 +408,14 @@ async def example_simple_evaluation():
         from src.evaluation.evaluator import example_simple_evaluation
         asyncio.run(example_simple_evaluation())
     """
-    import yaml
-    from dotenv import load_dotenv
-    
-    load_dotenv()
+    from src.config import get_config
     
     print("=" * 70)
     print("EXAMPLE 1: Simple Evaluation (No Orchestrator)")
     print("=" * 70)
     
     # Load config
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
+    config = get_config()
     
     # Create test queries in memory (no file needed)
     test_queries = [
@@ -450,18 +473,14 @@ async def example_with_orchestrator():
         from src.evaluation.evaluator import example_with_orchestrator
         asyncio.run(example_with_orchestrator())
     """
-    import yaml
-    from dotenv import load_dotenv
-    
-    load_dotenv()
+    from src.config import get_config
     
     print("=" * 70)
     print("EXAMPLE 2: Evaluation with Orchestrator")
     print("=" * 70)
     
     # Load config
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
+    config = get_config()
     
     # Initialize orchestrator
     # TODO: YOUR CODE HERE
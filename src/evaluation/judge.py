@@ -22,7 +22,8 @@ from typing import Dict, Any, List, Optional
 import logging
 import json
 import os
-from openai import OpenAI
+import asyncio
+from openai import AsyncOpenAI
 
 
 class LLMJudge:
@@ -62,13 +63,13 @@ class LLMJudge:
             api_key = os.getenv("OPENAI_API_KEY")
             if not api_key:
                 self.logger.warning("OPENAI_API_KEY not found in environment")
-            self.client = OpenAI(api_key=api_key) if api_key else None
+            self.client = AsyncOpenAI(api_key=api_key) if api_key else None
             self.base_url = None
         elif self.provider == "groq":
             api_key = os.getenv("GROQ_API_KEY")
             if not api_key:
                 self.logger.warning("GROQ_API_KEY not found in environment")
-            self.client = OpenAI(
+            self.client = AsyncOpenAI(
                 api_key=api_key,
                 base_url="https://api.groq.com/openai/v1"
             ) if api_key else None
@@ -117,21 +118,22 @@ class LLMJudge:
         total_weight = sum(c.get("weight", 1.0) for c in self.criteria)
         weighted_score = 0.0
 
-        # Evaluate each criterion
-        for criterion in self.criteria:
-            criterion_name = criterion.get("name", "unknown")
-            weight = criterion.get("weight", 1.0)
-
-            self.logger.info(f"Evaluating criterion: {criterion_name}")
-
-            # TODO: Implement actual LLM judging
-            score = await self._judge_criterion(
+        # Criteria are judged independently, so issue all judge calls at once
+        self.logger.info(f"Evaluating {len(self.criteria)} criteria concurrently")
+        scores = await asyncio.gather(*[
+            self._judge_criterion(
                 criterion=criterion,
                 query=query,
                 response=response,
                 sources=sources,
                 ground_truth=ground_truth
             )
+            for criterion in self.criteria
+        ])
+
+        for criterion, score in zip(self.criteria, scores):
+            criterion_name = criterion.get("name", "unknown")
+            weight = criterion.get("weight", 1.0)
 
             results["criterion_scores"][criterion_name] = score
             weighted_score += score.get("score", 0.0) * weight
@@ -260,7 +262,7 @@ Provide your evaluation in the following JSON format:
             self.logger.debug(f"Calling {self.provider} API with model: {model_name}")
             
             # Call API using OpenAI client (works for both OpenAI and Groq)
-            chat_completion = self.client.chat.completions.create(
+            chat_completion = await self.client.chat.completions.create(
                 messages=[
                     {
                         "role": "system",
@@ -330,14 +332,10 @@ async def example_basic_evaluation():
         from src.evaluation.judge import example_basic_evaluation
         asyncio.run(example_basic_evaluation())
     """
-    import yaml
-    from dotenv import load_dotenv
-    
-    load_dotenv()
+    from src.config import get_config
     
     # Load config
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
+    config = get_config()
     
     # Initialize judge
     judge = LLMJudge(config)
@@ -380,14 +378,10 @@ async def example_compare_responses():
         from src.evaluation.judge import example_compare_responses
         asyncio.run(example_compare_responses())
     """
-    import yaml
-    from dotenv import load_dotenv
-    
-    load_dotenv()
+    from src.config import get_config
     
     # Load config
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
+    config = get_config()
     
     # Initialize judge
     judge = LLMJudge(config)
@@ -0,0 +1,45 @@
+"""
+Guard Loader
+Builds Guardrails AI guards off the constructor's thread.
+
+Importing guardrails and constructing its validators loads ML models, which
+can take seconds. The guardrails submit their guard construction here and
+keep using the keyword fallback checks until the guard is ready.
+"""
+
+from typing import Any, Callable, Dict, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+
+# One worker: the builds mostly wait on the same imports and model loads
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="guard-loader")
+
+# Guard builds by configuration key; guards are only read during validation,
+# so instances can share them
+_GUARD_CACHE: Dict[Hashable, Future] = {}
+_GUARD_CACHE_LOCK = threading.Lock()
+
+
+def load_in_background(build: Callable[[], Any], key: Hashable = None) -> Future:
+    """
+    Run a guard builder on the background loader thread.
+
+    Builds are shared by key: guardrails constructed with the same key reuse
+    the first one's guard (and its loaded models) instead of building again.
+
+    Args:
+        build: Callable returning the built guard (or None if unavailable)
+        key: Hashable identifying the guard configuration (None never shares)
+
+    Returns:
+        Future resolving to the builder's result
+    """
+    if key is None:
+        return _EXECUTOR.submit(build)
+
+    with _GUARD_CACHE_LOCK:
+        future = _GUARD_CACHE.get(key)
+        if future is None:
+            future = _EXECUTOR.submit(build)
+            _GUARD_CACHE[key] = future
+        return future
@@ -0,0 +1,115 @@
+"""
+Keyword Matcher
+Multi-keyword substring search for the guardrails' fallback checks.
+
+Finds every keyword that occurs in a text in a single pass, instead of one
+substring scan per keyword. Uses the first available backend: a Hyperscan
+database (SIMD multi-pattern DFA), an Aho-Corasick automaton
+(pyahocorasick), or a precompiled regex alternation.
+Matching is case-insensitive and, like the `keyword in text.lower()` checks
+it replaces, also matches inside longer words.
+"""
+
+from typing import Iterable, Set
+import re
+import threading
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _collect_match(keyword_id, start, end, flags, found):
+    """Hyperscan match callback: record the keyword id and keep scanning."""
+    found.add(keyword_id)
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive search for a fixed set of keywords.
+
+    Example:
+        matcher = KeywordMatcher(["hack into", "ddos"])
+        found = matcher.find(text)  # e.g. {"ddos"}
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Build the matcher.
+
+        Args:
+            keywords: Keywords to search for
+        """
+        self.keywords = frozenset(kw.lower() for kw in keywords if kw)
+        self._database = None
+        self._automaton = None
+        self._regex = None
+
+        if not self.keywords:
+            return
+
+        # Hyperscan scans bytes, so it is only used for ASCII keywords, where
+        # its caseless mode matches the same text as str.lower()
+        if hyperscan is not None and all(kw.isascii() for kw in self.keywords):
+            self._ids = sorted(self.keywords)
+            self._database = hyperscan.Database()
+            self._database.compile(
+                expressions=[re.escape(kw).encode() for kw in self._ids],
+                ids=list(range(len(self._ids))),
+                elements=len(self._ids),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(self._ids),
+            )
+            # A database has one scratch space, so scans are serialized
+            self._scan_lock = threading.Lock()
+        elif ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for kw in self.keywords:
+                self._automaton.add_word(kw, kw)
+            self._automaton.make_automaton()
+        else:
+            # Longest first, so at each position the alternation reports the
+            # longest keyword; shorter keywords starting at the same position
+            # are prefixes of it and are added from _prefixes
+            self._ordered = sorted(self.keywords, key=len, reverse=True)
+            alternation = "|".join(f"({re.escape(kw)})" for kw in self._ordered)
+            # The lookahead lets matches overlap
+            self._regex = re.compile(f"(?=(?:{alternation}))", re.IGNORECASE)
+            self._prefixes = {
+                kw: [p for p in self.keywords if p != kw and kw.startswith(p)]
+                for kw in self.keywords
+            }
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Find the keywords that occur in a text.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Set of keywords (lowercase) found in the text
+        """
+        if self._database is not None:
+            ids = set()
+            with self._scan_lock:
+                self._database.scan(
+                    text.encode("utf-8"), match_event_handler=_collect_match, context=ids
+                )
+            return {self._ids[i] for i in ids}
+
+        if self._automaton is not None:
+            return {kw for _, kw in self._automaton.iter(text.lower())}
+
+        found = set()
+        if self._regex is not None:
+            for match in self._regex.finditer(text):
+                kw = self._ordered[match.lastindex - 1]
+                found.add(kw)
+                found.update(self._prefixes[kw])
+        return found
@@ -0,0 +1,32 @@
+"""
+Guardrail Types
+Records shared by the input and output guardrails.
+"""
+
+from typing import Any, Dict, NamedTuple, Tuple
+
+
+class Violation(NamedTuple):
+    """
+    A single guardrail violation.
+
+    Immutable, so memoized validation results can be handed out without
+    copying; validate() converts violations to the documented dict form.
+    """
+
+    validator: str
+    reason: str
+    severity: str
+    # Validator-specific fields, e.g. (("pii_type", "email"), ("matches", (...)))
+    details: Tuple[Tuple[str, Any], ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the violation dict returned by validate()."""
+        violation = {
+            "validator": self.validator,
+            "reason": self.reason,
+            "severity": self.severity,
+        }
+        for key, value in self.details:
+            violation[key] = list(value) if isinstance(value, tuple) else value
+        return violation
@@ -3,8 +3,94 @@ Input Guardrail
 Checks user inputs for safety violations using Guardrails AI framework.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set, Tuple
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from ._loader import load_in_background
+from ._matcher import KeywordMatcher
+from ._types import Violation
+
+
+# Basic toxic keyword list (expandable)
+_TOXIC_KEYWORDS = (
+    "violent", "kill", "harm", "attack", "abuse",
+    "hate", "racist", "sexist", "offensive",
+    # Malicious cyber activity keywords
+    "create virus", "create malware", "create ransomware",
+    "hack into", "exploit vulnerability", "ddos attack",
+    "create trojan", "create worm", "create spyware",
+    "bypass security", "crack password", "steal data"
+)
+
+# Common prompt injection patterns
+_INJECTION_PATTERNS = (
+    "ignore previous",
+    "ignore all previous",
+    "disregard",
+    "forget everything",
+    "new instructions",
+    "system prompt",
+    "you are now"
+)
+
+# Prohibited off-topic patterns (relevance only needs membership, so the
+# relevance groups are frozensets tested against the matcher's hits)
+_OFF_TOPIC_PATTERNS = frozenset([
+    "what's the weather",
+    "weather today",
+    "tell me a joke",
+    "tell me a funny",
+    "tell me something funny",
+    "make me laugh",
+    "play a game",
+    "write a poem",
+    "write me a poem",
+    "solve this math",
+    "solve math",
+    "calculate",
+    "recipe",
+    "cooking",
+    "virus",  # Block any mention of creating viruses
+    "malware",
+    "ransomware",
+    "trojan",
+    "worm",
+    "spyware",
+    "hack into",
+    "hack a",
+    "exploit",
+    "ddos",
+    "crack password",
+    "bypass security",
+])
+
+# Malicious intent patterns (multi-word), flagged together with a harmful target
+_MALICIOUS_PATTERNS = frozenset([
+    "how to create",
+    "how to make",
+    "how to build",
+    "steps to create",
+    "guide to creating",
+])
+_HARMFUL_TARGETS = frozenset(["virus", "malware", "ransomware", "trojan", "worm", "exploit"])
+
+# Keywords indicating the query is about the research topic
+# (AI-Generated Synthetic Realities)
+_TOPIC_KEYWORDS = frozenset([
+    "synthetic", "ai", "artificial intelligence", "generative",
+    "virtual", "simulation", "reality", "world", "environment",
+    "immersive", "3d", "unreal", "unity", "metaverse",
+    "procedural generation", "neural rendering", "human-ai",
+    "co-creation", "collaboration"
+])
+
+# One matcher for every keyword list, so a query is scanned once per validate()
+_MATCHER = KeywordMatcher(
+    _TOXIC_KEYWORDS + _INJECTION_PATTERNS
+    + tuple(_OFF_TOPIC_PATTERNS | _MALICIOUS_PATTERNS | _HARMFUL_TARGETS | _TOPIC_KEYWORDS)
+)
 
 
 class InputGuardrail:
@@ -33,17 +119,34 @@ class InputGuardrail:
         safety_config = config.get("safety", {})
         self.enabled = safety_config.get("enabled", True)
         self.prohibited_categories = safety_config.get("prohibited_categories", [])
+        self.fail_fast = safety_config.get("fail_fast", True)
+        
+        # Configured research topic (lowercase), used by the relevance check
+        self._system_topic_lower = config.get("system", {}).get("topic", "").lower()
+        
+        # Memoize results for repeated inputs (retries, agent loops, benchmarks)
+        cache_size = safety_config.get("validation_cache_size", 1024)
+        self._validate_cached = lru_cache(maxsize=cache_size)(self._validate)
         
-        # Initialize Guardrails AI
+        # Initialize Guardrails AI in the background; until the guard is
+        # ready, validate() uses the fallback checks
+        self.guard = None
+        self.guardrails_available = False
+        self._guard_future = load_in_background(
+            self._build_guard, key=("input", config.get("system", {}).get("topic", ""))
+        )
+
+    def _build_guard(self):
+        """Build the Guardrails AI guard; runs on the loader thread."""
         try:
             from guardrails import Guard
             from guardrails.hub import ToxicLanguage, RestrictToTopic
             
             # Create guard with validators
-            self.guard = Guard()
+            guard = Guard()
             
             # Add length validator (10-2000 characters)
-            self.guard = self.guard.use(
+            guard = guard.use(
                 ToxicLanguage(
                     threshold=0.5,
                     validation_method="sentence",
@@ -53,9 +156,9 @@ class InputGuardrail:
             )
             
             # Add topic restriction if configured
-            system_topic = config.get("system", {}).get("topic", "")
+            system_topic = self.config.get("system", {}).get("topic", "")
             if system_topic:
-                self.guard = self.guard.use(
+                guard = guard.use(
                     RestrictToTopic(
                         valid_topics=[system_topic, "research", "academic"],
                         invalid_topics=["medical advice", "legal advice", "financial advice"],
@@ -64,17 +167,37 @@ class InputGuardrail:
                     on="prompt"
                 )
             
-            self.guardrails_available = True
             self.logger.info("Guardrails AI initialized successfully")
+            return guard
             
         except ImportError:
             self.logger.warning("Guardrails AI not available, using fallback validation")
-            self.guard = None
-            self.guardrails_available = False
+            return None
         except Exception as e:
             self.logger.error(f"Error initializing Guardrails AI: {e}")
-            self.guard = None
-            self.guardrails_available = False
+            return None
+
+    def _poll_guard(self):
+        """Adopt the background-built guard once it is ready."""
+        if self._guard_future is None or not self._guard_future.done():
+            return
+        self.guard = self._guard_future.result()
+        self.guardrails_available = self.guard is not None
+        self._guard_future = None
+        if self.guardrails_available:
+            # Results memoized so far came from the fallback checks only
+            self._validate_cached.cache_clear()
+
+    def wait_ready(self, timeout: Optional[float] = None):
+        """
+        Block until the background guard build has finished.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        """
+        if self._guard_future is not None:
+            self._guard_future.result(timeout=timeout)
+        self._poll_guard()
 
     def validate(self, query: str) -> Dict[str, Any]:
         """
@@ -93,27 +216,77 @@ class InputGuardrail:
                 "sanitized_input": query
             }
         
+        self._poll_guard()
+        
+        return self._to_result(query, self._validate_cached(query))
+
+    def validate_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Validate several input queries.
+
+        Duplicate queries are validated once. When the Guardrails AI guard is
+        in use, its model calls run concurrently on a thread pool.
+
+        Args:
+            queries: User inputs to validate
+
+        Returns:
+            Validation results, in the same order as queries
+        """
+        if not self.enabled:
+            return [self.validate(query) for query in queries]
+        
+        self._poll_guard()
+        
+        unique = list(dict.fromkeys(queries))
+        if self.guardrails_available and len(unique) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(unique), 8)) as executor:
+                results = dict(zip(unique, executor.map(self._validate_cached, unique)))
+        else:
+            results = {query: self._validate_cached(query) for query in unique}
+        
+        return [self._to_result(query, results[query]) for query in queries]
+
+    @staticmethod
+    def _to_result(query: str, violations: Tuple[Violation, ...]) -> Dict[str, Any]:
+        """Build the validate() result; fresh dicts, so callers may mutate it."""
+        return {
+            "valid": len(violations) == 0,
+            "violations": [violation.to_dict() for violation in violations],
+            "sanitized_input": query  # Could implement sanitization if needed
+        }
+
+    def _validate(self, query: str) -> Tuple[Violation, ...]:
+        """Run the input checks; memoized per instance by validate()."""
         violations = []
         
+        # Find all keywords once; each check below filters its own lists
+        found = _MATCHER.find(query)
+        
         # Basic length check (always applied)
         if len(query) < 5:
-            violations.append({
-                "validator": "length",
-                "reason": "Query too short (minimum 5 characters)",
-                "severity": "low"
-            })
+            violations.append(Violation(
+                "length",
+                "Query too short (minimum 5 characters)",
+                "low"
+            ))
         
         if len(query) > 2000:
-            violations.append({
-                "validator": "length",
-                "reason": "Query too long (maximum 2000 characters)",
-                "severity": "medium"
-            })
+            violations.append(Violation(
+                "length",
+                "Query too long (maximum 2000 characters)",
+                "medium"
+            ))
         
         # Prompt injection check
-        injection_violations = self._check_prompt_injection(query)
+        injection_violations = self._check_prompt_injection(query, found)
         violations.extend(injection_violations)
         
+        # With fail_fast, a high-severity hit already decides the verdict, so
+        # the remaining checks (notably the Guardrails AI model call) are skipped
+        if self._should_stop(violations):
+            return tuple(violations)
+        
         # Use Guardrails AI if available
         if self.guardrails_available and self.guard:
             try:
@@ -122,31 +295,32 @@ class InputGuardrail:
                 # Check if validation passed
                 if not result.validation_passed:
                     for error in result.error_spans_in_output:
-                        violations.append({
-                            "validator": "guardrails_ai",
-                            "reason": str(error),
-                            "severity": "high"
-                        })
+                        violations.append(Violation(
+                            "guardrails_ai",
+                            str(error),
+                            "high"
+                        ))
             except Exception as e:
                 self.logger.warning(f"Guardrails AI validation failed: {e}")
                 # Fall back to basic checks
-                toxic_violations = self._check_toxic_language(query)
+                toxic_violations = self._check_toxic_language(query, found)
                 violations.extend(toxic_violations)
         else:
             # Fallback validation without Guardrails AI
-            toxic_violations = self._check_toxic_language(query)
+            toxic_violations = self._check_toxic_language(query, found)
             violations.extend(toxic_violations)
             
-            relevance_violations = self._check_relevance(query)
-            violations.extend(relevance_violations)
+            if not self._should_stop(violations):
+                relevance_violations = self._check_relevance(query, found)
+                violations.extend(relevance_violations)
         
-        return {
-            "valid": len(violations) == 0,
-            "violations": violations,
-            "sanitized_input": query  # Could implement sanitization if needed
-        }
+        return tuple(violations)
+
+    def _should_stop(self, violations: List[Violation]) -> bool:
+        """Whether fail_fast applies: a high-severity violation was already found."""
+        return self.fail_fast and any(v.severity == "high" for v in violations)
 
-    def _check_toxic_language(self, text: str) -> List[Dict[str, Any]]:
+    def _check_toxic_language(self, text: str, found: Optional[Set[str]] = None) -> List[Violation]:
         """
         Check for toxic/harmful language using keyword matching.
         
@@ -155,30 +329,20 @@ class InputGuardrail:
         """
         violations = []
         
-        # Basic toxic keyword list (expandable)
-        toxic_keywords = [
-            "violent", "kill", "harm", "attack", "abuse",
-            "hate", "racist", "sexist", "offensive",
-            # Malicious cyber activity keywords
-            "create virus", "create malware", "create ransomware",
-            "hack into", "exploit vulnerability", "ddos attack",
-            "create trojan", "create worm", "create spyware",
-            "bypass security", "crack password", "steal data"
-        ]
-        
-        text_lower = text.lower()
-        found_keywords = [kw for kw in toxic_keywords if kw in text_lower]
+        if found is None:
+            found = _MATCHER.find(text)
+        found_keywords = [kw for kw in _TOXIC_KEYWORDS if kw in found]
         
         if found_keywords:
-            violations.append({
-                "validator": "toxic_language",
-                "reason": f"Contains potentially toxic language: {', '.join(found_keywords)}",
-                "severity": "high"
-            })
+            violations.append(Violation(
+                "toxic_language",
+                f"Contains potentially toxic language: {', '.join(found_keywords)}",
+                "high"
+            ))
         
         return violations
 
-    def _check_prompt_injection(self, text: str) -> List[Dict[str, Any]]:
+    def _check_prompt_injection(self, text: str, found: Optional[Set[str]] = None) -> List[Violation]:
         """
         Check for prompt injection attempts.
 
@@ -186,29 +350,20 @@ class InputGuardrail:
         """
         violations = []
         # Check for common prompt injection patterns
-        injection_patterns = [
-            "ignore previous",
-            "ignore all previous",
-            "disregard",
-            "forget everything",
-            "new instructions",
-            "system prompt",
-            "you are now"
-        ]
-        
-        text_lower = text.lower()
-        found_patterns = [p for p in injection_patterns if p in text_lower]
+        if found is None:
+            found = _MATCHER.find(text)
+        found_patterns = [p for p in _INJECTION_PATTERNS if p in found]
         
         if found_patterns:
-            violations.append({
-                "validator": "prompt_injection",
-                "reason": f"Potential prompt injection detected: {', '.join(found_patterns)}",
-                "severity": "high"
-            })
+            violations.append(Violation(
+                "prompt_injection",
+                f"Potential prompt injection detected: {', '.join(found_patterns)}",
+                "high"
+            ))
         
         return violations
 
-    def _check_relevance(self, query: str) -> List[Dict[str, Any]]:
+    def _check_relevance(self, query: str, found: Optional[Set[str]] = None) -> List[Violation]:
         """
         Check if query is relevant to the system's configured topic.
         
@@ -216,96 +371,46 @@ class InputGuardrail:
         """
         violations = []
         
-        # Get configured topic from config
-        system_topic = self.config.get("system", {}).get("topic", "").lower()
+        system_topic = self._system_topic_lower
         
         if not system_topic:
             # No topic restriction configured
             return violations
         
-        # Check for prohibited off-topic patterns
-        off_topic_patterns = [
-            "what's the weather",
-            "weather today",
-            "tell me a joke",
-            "tell me a funny",
-            "tell me something funny",
-            "make me laugh",
-            "play a game",
-            "write a poem",
-            "write me a poem",
-            "solve this math",
-            "solve math",
-            "calculate",
-            "recipe",
-            "cooking",
-            "virus",  # Block any mention of creating viruses
-            "malware",
-            "ransomware",
-            "trojan",
-            "worm",
-            "spyware",
-            "hack into",
-            "hack a",
-            "exploit",
-            "ddos",
-            "crack password",
-            "bypass security",
-        ]
-        
-        # Malicious intent patterns (multi-word)
-        malicious_patterns = [
-            "how to create",
-            "how to make",
-            "how to build",
-            "steps to create",
-            "guide to creating",
-        ]
-        
-        query_lower = query.lower()
+        if found is None:
+            found = _MATCHER.find(query)
         
         # Check for malicious combinations
-        has_malicious_intent = any(pattern in query_lower for pattern in malicious_patterns)
-        has_harmful_target = any(pattern in query_lower for pattern in ["virus", "malware", "ransomware", "trojan", "worm", "exploit"])
+        has_malicious_intent = not _MALICIOUS_PATTERNS.isdisjoint(found)
+        has_harmful_target = not _HARMFUL_TARGETS.isdisjoint(found)
         
         if has_malicious_intent and has_harmful_target:
-            violations.append({
-                "validator": "relevance",
-                "reason": f"Query requests malicious content that is not related to {system_topic} research",
-                "severity": "high"
-            })
+            violations.append(Violation(
+                "relevance",
+                f"Query requests malicious content that is not related to {system_topic} research",
+                "high"
+            ))
             return violations
         
-        query_lower = query.lower()
-        
         # First check explicit off-topic patterns
-        for pattern in off_topic_patterns:
-            if pattern in query_lower:
-                violations.append({
-                    "validator": "relevance",
-                    "reason": f"Query appears off-topic for {system_topic} research",
-                    "severity": "high"
-                })
-                return violations
+        if not _OFF_TOPIC_PATTERNS.isdisjoint(found):
+            violations.append(Violation(
+                "relevance",
+                f"Query appears off-topic for {system_topic} research",
+                "high"
+            ))
+            return violations
         
         # Check if query is actually about the research topic
-        # For "AI-Generated Synthetic Realities", look for relevant keywords
-        topic_keywords = [
-            "synthetic", "ai", "artificial intelligence", "generative",
-            "virtual", "simulation", "reality", "world", "environment",
-            "immersive", "3d", "unreal", "unity", "metaverse",
-            "procedural generation", "neural rendering", "human-ai",
-            "co-creation", "collaboration"
-        ]
-        
         # If query is longer than 10 words, check for at least one topic keyword
-        if len(query_lower.split()) > 10:
-            has_topic_keyword = any(keyword in query_lower for keyword in topic_keywords)
+        # (maxsplit stops after 11 tokens instead of splitting the whole query)
+        if len(query.split(None, 10)) > 10:
+            has_topic_keyword = not _TOPIC_KEYWORDS.isdisjoint(found)
             if not has_topic_keyword:
-                violations.append({
-                    "validator": "relevance",
-                    "reason": f"Query does not appear related to {system_topic}. Please ask about AI-generated synthetic worlds, virtual environments, or human-AI co-creation.",
-                    "severity": "medium"
-                })
+                violations.append(Violation(
+                    "relevance",
+                    f"Query does not appear related to {system_topic}. Please ask about AI-generated synthetic worlds, virtual environments, or human-AI co-creation.",
+                    "medium"
+                ))
         
         return violations
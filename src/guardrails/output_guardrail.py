@@ -3,9 +3,88 @@ Output Guardrail
 Checks system outputs for safety violations.
 """
 
-from typing import Dict, Any, List
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+)
 import re
 import logging
+import string
+from functools import lru_cache
+
+from ._loader import load_in_background
+from ._matcher import KeywordMatcher
+from ._types import Violation
+
+
+# Prohibited content categories from config
+_HARMFUL_PATTERNS = {
+    "violent": ("kill", "murder", "violence", "attack", "assault"),
+    "hateful": ("hate", "racist", "sexist", "discrimination"),
+    "dangerous": ("bomb", "weapon", "suicide", "self-harm"),
+    "inappropriate": ("explicit", "pornographic", "sexual")
+}
+
+# Biased terms to flag
+_BIASED_TERMS = {
+    "gender": ("mankind", "manpower", "he/she"),
+    "ageism": ("elderly", "old people", "young people"),
+    "ableism": ("crazy", "insane", "lame", "blind to"),
+}
+
+# Simple regex patterns for common PII
+# Note: Phone pattern requires spaces or dashes to avoid false positives with DOIs/URLs
+_PII_PATTERNS: Tuple[Tuple[str, "re.Pattern"], ...] = (
+    ("email", re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')),
+    ("phone", re.compile(r'(?<!/)(?<!\.)\b\d{3}[-\s]\d{3}[-\s]\d{4}\b(?!/)')),  # Requires space or dash between groups
+    ("ssn", re.compile(r'\b\d{3}-\d{2}-\d{4}\b')),
+)
+_PII_TYPES = tuple(pii_type for pii_type, _ in _PII_PATTERNS)
+
+# The same patterns fused into one alternation of named groups, so a response
+# is scanned once
+_PII_RE = re.compile(
+    "|".join(f"(?P<{pii_type}>{pattern.pattern})" for pii_type, pattern in _PII_PATTERNS)
+)
+
+# Common indicators of fabrication
+_FABRICATION_INDICATORS = (
+    "i think", "i believe", "probably", "maybe", "might be",
+    "not sure", "unclear", "uncertain"
+)
+
+# Bracketed citation markers such as [1] or [Smith 2023]
+_CITATION_RE = re.compile(r'\[[^\]\n]{1,100}\]')
+
+# Mentions that count as referring to sources
+_REFERENCE_TERMS = ("reference", "source")
+
+# Scanned together, so the factual consistency check needs no lowercased copy
+_CONSISTENCY_MATCHER = KeywordMatcher(_FABRICATION_INDICATORS + _REFERENCE_TERMS)
+
+# Characters of already-checked text kept in front of each streamed chunk, so
+# keywords and PII split across chunk boundaries are still found
+_STREAM_TAIL_CHARS = 256
+
+# Characters that can continue a PII match at the end of a streamed chunk
+_PII_CONTINUATION_CHARS = string.ascii_letters + string.digits + "._%+-@"
+
+
+def _has_pii(text: str) -> bool:
+    """Whether text contains any PII; stops at the first match."""
+    return _PII_RE.search(text) is not None
+
+
+@lru_cache(maxsize=None)
+def _keyword_matcher(harmful_categories: Tuple[str, ...]) -> KeywordMatcher:
+    """
+    One matcher for the enabled harmful categories and the biased terms, so a
+    response is scanned once per validate(). Shared by guardrails configured
+    with the same categories.
+    """
+    return KeywordMatcher(
+        [kw for category in harmful_categories for kw in _HARMFUL_PATTERNS[category]]
+        + [term for terms in _BIASED_TERMS.values() for term in terms]
+    )
 
 
 class OutputGuardrail:
@@ -35,16 +114,37 @@ class OutputGuardrail:
         self.enabled = safety_config.get("enabled", True)
         self.prohibited_categories = safety_config.get("prohibited_categories", [])
         
-        # Initialize Guardrails AI
+        # Harmful categories to check, resolved once for this configuration
+        self._harmful_patterns = {
+            category: keywords
+            for category, keywords in _HARMFUL_PATTERNS.items()
+            if category in self.prohibited_categories or not self.prohibited_categories
+        }
+        self._matcher = _keyword_matcher(tuple(self._harmful_patterns))
+        
+        # Memoize results for repeated responses (retries, agent loops, benchmarks)
+        cache_size = safety_config.get("validation_cache_size", 1024)
+        self._validate_cached = lru_cache(maxsize=cache_size)(self._validate)
+        
+        # Initialize Guardrails AI in the background; until the guard is
+        # ready, validate() uses the fallback checks
+        self.guard = None
+        self.guardrails_available = False
+        self._guard_future = load_in_background(
+            self._build_guard, key=("output",)
+        )
+
+    def _build_guard(self):
+        """Build the Guardrails AI guard; runs on the loader thread."""
         try:
             from guardrails import Guard
             from guardrails.hub import ToxicLanguage, DetectPII
             
             # Create guard with validators
-            self.guard = Guard()
+            guard = Guard()
             
             # Add toxic language detector
-            self.guard = self.guard.use(
+            guard = guard.use(
                 ToxicLanguage(
                     threshold=0.5,
                     validation_method="sentence",
@@ -54,7 +154,7 @@ class OutputGuardrail:
             )
             
             # Add PII detector
-            self.guard = self.guard.use(
+            guard = guard.use(
                 DetectPII(
                     pii_entities=["EMAIL_ADDRESS", "PHONE_NUMBER", "SSN", "CREDIT_CARD"],
                     on_fail="exception"
@@ -62,17 +162,37 @@ class OutputGuardrail:
                 on="output"
             )
             
-            self.guardrails_available = True
             self.logger.info("Output Guardrails AI initialized successfully")
+            return guard
             
         except ImportError:
             self.logger.warning("Guardrails AI not available, using fallback validation")
-            self.guard = None
-            self.guardrails_available = False
+            return None
         except Exception as e:
             self.logger.error(f"Error initializing Guardrails AI: {e}")
-            self.guard = None
-            self.guardrails_available = False
+            return None
+
+    def _poll_guard(self):
+        """Adopt the background-built guard once it is ready."""
+        if self._guard_future is None or not self._guard_future.done():
+            return
+        self.guard = self._guard_future.result()
+        self.guardrails_available = self.guard is not None
+        self._guard_future = None
+        if self.guardrails_available:
+            # Results memoized so far came from the fallback checks only
+            self._validate_cached.cache_clear()
+
+    def wait_ready(self, timeout: Optional[float] = None):
+        """
+        Block until the background guard build has finished.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        """
+        if self._guard_future is not None:
+            self._guard_future.result(timeout=timeout)
+        self._poll_guard()
 
     def validate(self, response: str, sources: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -92,8 +212,67 @@ class OutputGuardrail:
                 "sanitized_output": response
             }
         
+        self._poll_guard()
+        
+        violations, sanitized = self._validate_cached(response)
+        
+        # Check factual consistency if sources provided (not memoized, since
+        # sources are unhashable; sanitization only redacts PII, so
+        # sanitized_output is unaffected)
+        if sources:
+            consistency_violations = self._check_factual_consistency(response, sources)
+            violations = violations + tuple(consistency_violations)
+        
+        # Fresh dicts on every call, so callers may mutate the result
+        return {
+            "valid": len(violations) == 0,
+            "violations": [violation.to_dict() for violation in violations],
+            "sanitized_output": sanitized
+        }
+
+    def validate_stream(self, chunks: Iterable[str]) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Validate a response while it is being generated.
+
+        Runs the keyword and PII checks on each chunk as it arrives, so a
+        violation is flagged at the chunk where it completes instead of after
+        the whole generation. Source-dependent checks and the Guardrails AI
+        guard need the full text; run validate() on it once streaming ends.
+
+        Args:
+            chunks: Response text chunks, in order
+
+        Yields:
+            (chunk, violations) pairs; each match is reported only once. PII
+            that could still continue into the next chunk is held back until
+            the text shows it is complete, so PII completed by the last chunk
+            comes in a final ("", violations) pair
+        """
+        stream = _StreamCheck(self)
+        for chunk in chunks:
+            yield chunk, stream.feed(chunk)
+        violations = stream.finish()
+        if violations:
+            yield "", violations
+
+    async def avalidate_stream(
+        self, chunks: AsyncIterable[str]
+    ) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Async variant of validate_stream for streaming model clients."""
+        stream = _StreamCheck(self)
+        async for chunk in chunks:
+            yield chunk, stream.feed(chunk)
+        violations = stream.finish()
+        if violations:
+            yield "", violations
+
+    def _validate(self, response: str) -> Tuple[Tuple[Violation, ...], str]:
+        """Run the source-independent output checks; memoized per instance by validate()."""
         violations = []
         
+        # Find all harmful/biased keywords once for the checks below
+        found = self._matcher.find(response)
+        
         # Use Guardrails AI if available
         if self.guardrails_available and self.guard:
             try:
@@ -102,11 +281,11 @@ class OutputGuardrail:
                 # Check if validation passed
                 if not result.validation_passed:
                     for error in result.error_spans_in_output:
-                        violations.append({
-                            "validator": "guardrails_ai",
-                            "reason": str(error),
-                            "severity": "high"
-                        })
+                        violations.append(Violation(
+                            "guardrails_ai",
+                            str(error),
+                            "high"
+                        ))
                         
             except Exception as e:
                 self.logger.warning(f"Guardrails AI validation error: {e}")
@@ -114,61 +293,63 @@ class OutputGuardrail:
                 pii_violations = self._check_pii(response)
                 violations.extend(pii_violations)
                 
-                harmful_violations = self._check_harmful_content(response)
+                harmful_violations = self._check_harmful_content(response, found)
                 violations.extend(harmful_violations)
         else:
             # Fallback validation without Guardrails AI
             pii_violations = self._check_pii(response)
             violations.extend(pii_violations)
             
-            harmful_violations = self._check_harmful_content(response)
+            harmful_violations = self._check_harmful_content(response, found)
             violations.extend(harmful_violations)
         
         # Check for bias (always applied)
-        bias_violations = self._check_bias(response)
+        bias_violations = self._check_bias(response, found)
         violations.extend(bias_violations)
         
-        # Check factual consistency if sources provided
-        if sources:
-            consistency_violations = self._check_factual_consistency(response, sources)
-            violations.extend(consistency_violations)
-        
-        return {
-            "valid": len(violations) == 0,
-            "violations": violations,
-            "sanitized_output": self._sanitize(response, violations) if violations else response
-        }
+        sanitized = self._sanitize(response, violations) if violations else response
+        return tuple(violations), sanitized
 
-    def _check_pii(self, text: str) -> List[Dict[str, Any]]:
+    def _check_pii(
+        self, text: str, start: int = 0, end: Optional[int] = None
+    ) -> List[Violation]:
         """
         Check for personally identifiable information.
 
+        Only matches ending after `start` and no later than `end` are
+        reported (used by validate_stream to skip text already checked and to
+        hold back matches that may still grow).
+
         TODO: YOUR CODE HERE Implement comprehensive PII detection
         """
         violations = []
 
-        # Simple regex patterns for common PII
-        # Note: Phone pattern requires spaces or dashes to avoid false positives with DOIs/URLs
-        patterns = {
-            "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            "phone": r'(?<!/)(?<!\.)\b\d{3}[-\s]\d{3}[-\s]\d{4}\b(?!/)',  # Requires space or dash between groups
-            "ssn": r'\b\d{3}-\d{2}-\d{4}\b',
-        }
+        # Most responses are clean: a search that stops at the first match
+        # settles that without collecting matches
+        if not _has_pii(text):
+            return violations
+
+        # Single pass over the text; each match is attributed to its named group
+        if end is None:
+            end = len(text)
+        found = {}
+        for match in _PII_RE.finditer(text):
+            if start < match.end() <= end:
+                found.setdefault(match.lastgroup, []).append(match.group())
 
-        for pii_type, pattern in patterns.items():
-            matches = re.findall(pattern, text)
+        for pii_type in _PII_TYPES:
+            matches = found.get(pii_type)
             if matches:
-                violations.append({
-                    "validator": "pii",
-                    "pii_type": pii_type,
-                    "reason": f"Contains {pii_type}",
-                    "severity": "high",
-                    "matches": matches
-                })
+                violations.append(Violation(
+                    "pii",
+                    f"Contains {pii_type}",
+                    "high",
+                    (("pii_type", pii_type), ("matches", tuple(matches)))
+                ))
 
         return violations
 
-    def _check_harmful_content(self, text: str) -> List[Dict[str, Any]]:
+    def _check_harmful_content(self, text: str, found: Optional[Set[str]] = None) -> List[Violation]:
         """
         Check for harmful or inappropriate content using keyword matching.
         
@@ -177,26 +358,18 @@ class OutputGuardrail:
         """
         violations = []
         
-        # Prohibited content categories from config
-        harmful_patterns = {
-            "violent": ["kill", "murder", "violence", "attack", "assault"],
-            "hateful": ["hate", "racist", "sexist", "discrimination"],
-            "dangerous": ["bomb", "weapon", "suicide", "self-harm"],
-            "inappropriate": ["explicit", "pornographic", "sexual"]
-        }
-        
-        text_lower = text.lower()
+        if found is None:
+            found = self._matcher.find(text)
         
-        for category, keywords in harmful_patterns.items():
-            if category in self.prohibited_categories or not self.prohibited_categories:
-                found = [kw for kw in keywords if kw in text_lower]
-                if found:
-                    violations.append({
-                        "validator": "harmful_content",
-                        "category": category,
-                        "reason": f"Contains potentially {category} content: {', '.join(found)}",
-                        "severity": "high"
-                    })
+        for category, keywords in self._harmful_patterns.items():
+            found_keywords = [kw for kw in keywords if kw in found]
+            if found_keywords:
+                violations.append(Violation(
+                    "harmful_content",
+                    f"Contains potentially {category} content: {', '.join(found_keywords)}",
+                    "high",
+                    (("category", category),)
+                ))
         
         return violations
 
@@ -204,7 +377,7 @@ class OutputGuardrail:
         self,
         response: str,
         sources: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Violation]:
         """
         Check if response is consistent with sources.
         
@@ -217,36 +390,32 @@ class OutputGuardrail:
             # No sources to check against
             return violations
         
+        found = _CONSISTENCY_MATCHER.find(response)
+        
         # Check if response includes citations
-        has_citations = "[" in response and "]" in response
-        has_references = "reference" in response.lower() or "source" in response.lower()
+        has_citations = _CITATION_RE.search(response) is not None
+        has_references = any(term in found for term in _REFERENCE_TERMS)
         
         if not has_citations and not has_references:
-            violations.append({
-                "validator": "factual_consistency",
-                "reason": "Response does not cite sources",
-                "severity": "medium"
-            })
+            violations.append(Violation(
+                "factual_consistency",
+                "Response does not cite sources",
+                "medium"
+            ))
         
         # Check for common indicators of fabrication
-        fabrication_indicators = [
-            "i think", "i believe", "probably", "maybe", "might be",
-            "not sure", "unclear", "uncertain"
-        ]
-        
-        text_lower = response.lower()
-        found_indicators = [ind for ind in fabrication_indicators if ind in text_lower]
+        found_indicators = [ind for ind in _FABRICATION_INDICATORS if ind in found]
         
         if found_indicators:
-            violations.append({
-                "validator": "factual_consistency",
-                "reason": f"Response contains uncertainty indicators: {', '.join(found_indicators)}",
-                "severity": "low"
-            })
+            violations.append(Violation(
+                "factual_consistency",
+                f"Response contains uncertainty indicators: {', '.join(found_indicators)}",
+                "low"
+            ))
         
         return violations
 
-    def _check_bias(self, text: str) -> List[Dict[str, Any]]:
+    def _check_bias(self, text: str, found: Optional[Set[str]] = None) -> List[Violation]:
         """
         Check for biased or non-inclusive language.
         
@@ -254,39 +423,75 @@ class OutputGuardrail:
         """
         violations = []
         
-        # Biased terms to flag
-        biased_terms = {
-            "gender": ["mankind", "manpower", "he/she"],
-            "ageism": ["elderly", "old people", "young people"],
-            "ableism": ["crazy", "insane", "lame", "blind to"],
-        }
-        
-        text_lower = text.lower()
+        if found is None:
+            found = self._matcher.find(text)
         
-        for bias_type, terms in biased_terms.items():
-            found = [term for term in terms if term in text_lower]
-            if found:
-                violations.append({
-                    "validator": "bias_detection",
-                    "bias_type": bias_type,
-                    "reason": f"Contains potentially biased language ({bias_type}): {', '.join(found)}",
-                    "severity": "low"
-                })
+        for bias_type, terms in _BIASED_TERMS.items():
+            found_terms = [term for term in terms if term in found]
+            if found_terms:
+                violations.append(Violation(
+                    "bias_detection",
+                    f"Contains potentially biased language ({bias_type}): {', '.join(found_terms)}",
+                    "low",
+                    (("bias_type", bias_type),)
+                ))
         
         return violations
 
-    def _sanitize(self, text: str, violations: List[Dict[str, Any]]) -> str:
+    def _sanitize(self, text: str, violations: List[Violation]) -> str:
         """
         Sanitize text by removing/redacting violations.
 
         TODO: YOUR CODE HERE Implement sanitization logic
         """
-        sanitized = text
+        # Redact PII in a single pass with the same pattern that detected it
+        if any(violation.validator == "pii" for violation in violations):
+            return _PII_RE.sub("[REDACTED]", text)
+
+        return text
+
+
+class _StreamCheck:
+    """Incremental keyword and PII checks over a streamed response."""
+
+    def __init__(self, guardrail: OutputGuardrail):
+        self.guardrail = guardrail
+        self.tail = ""
+        self.reported: Set[str] = set()
+        # Stream offsets: where the tail starts, and up to where PII matches
+        # have been reported
+        self.tail_offset = 0
+        self.checked = 0
+
+    def feed(self, chunk: str, final: bool = False) -> List[Dict[str, Any]]:
+        """Check a chunk together with the tail before it; return new violations."""
+        if not self.guardrail.enabled:
+            return []
+
+        window = self.tail + chunk
+        found = self.guardrail._matcher.find(window) - self.reported
+        self.reported |= found
+
+        # A PII match may still grow with the next chunk while only
+        # characters that can continue it follow (e.g. "bob@ex.co." before
+        # "uk"), so it is only reported once a character that ends it, or the
+        # end of the stream, follows. Matches ending before the last such
+        # character are complete.
+        if final:
+            end = len(window)
+        else:
+            end = len(window.rstrip(_PII_CONTINUATION_CHARS)) - 1
+        violations = self.guardrail._check_pii(
+            window, start=max(self.checked - self.tail_offset, 0), end=end
+        )
+        self.checked = max(self.checked, self.tail_offset + end)
+        violations.extend(self.guardrail._check_harmful_content(window, found))
+        violations.extend(self.guardrail._check_bias(window, found))
 
-        # Redact PII
-        for violation in violations:
-            if violation.get("validator") == "pii":
-                for match in violation.get("matches", []):
-                    sanitized = sanitized.replace(match, "[REDACTED]")
+        self.tail = window[-_STREAM_TAIL_CHARS:]
+        self.tail_offset += len(window) - len(self.tail)
+        return [violation.to_dict() for violation in violations]
 
-        return sanitized
+    def finish(self) -> List[Dict[str, Any]]:
+        """Report PII held back at the end of the stream."""
+        return self.feed("", final=True)
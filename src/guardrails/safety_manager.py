@@ -3,12 +3,33 @@ Safety Manager
 Coordinates safety guardrails and logs safety events.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Deque, List, Optional
+import atexit
+import gzip
 import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
 from datetime import datetime
 import json
 
 
+# Safety log writer: events are written in batches of up to this many, or
+# whatever has arrived within the batch window
+_LOG_BATCH_SIZE = 64
+_LOG_BATCH_WINDOW = 0.25  # seconds
+_LOG_QUEUE_SIZE = 10000
+
+# Safety events kept in memory by default (older events are dropped)
+_MAX_EVENTS = 4096
+
+
+def _preview(content: str, limit: int = 100) -> str:
+    """Truncate content for a safety event's content_preview."""
+    return content[:limit] + "..." if len(content) > limit else content
+
+
 class SafetyManager:
     """
     Manages safety guardrails for the multi-agent system.
@@ -35,8 +56,13 @@ class SafetyManager:
         self.log_events = safety_config.get("log_events", True)
         self.logger = logging.getLogger("safety")
 
-        # Safety event log
-        self.safety_events: List[Dict[str, Any]] = []
+        # Safety event log: the most recent events, plus running counts over
+        # all events so get_safety_stats() need not scan the log
+        self.safety_events: Deque[Dict[str, Any]] = deque(
+            maxlen=safety_config.get("max_events", _MAX_EVENTS)
+        )
+        self._event_counts = Counter()
+        self._events_lock = threading.Lock()
 
         # Prohibited categories
         self.prohibited_categories = safety_config.get("prohibited_categories", [
@@ -49,6 +75,26 @@ class SafetyManager:
         # Violation response strategy
         self.on_violation = safety_config.get("on_violation", {})
 
+        # Safety log file writes happen on a background thread, off the
+        # request path; events are queued by _log_safety_event
+        self._event_queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        log_file = safety_config.get("safety_log_file")
+        self._log_file: Optional[str] = log_file if self.log_events else None
+        # Guards _event_queue against close(), and serializes direct writes
+        # to the log file after it
+        self._log_lock = threading.Lock()
+        if self._log_file:
+            self._event_queue = queue.Queue(maxsize=_LOG_QUEUE_SIZE)
+            self._writer = threading.Thread(
+                target=self._event_writer_loop,
+                args=(self._event_queue,),
+                name="safety-log-writer",
+                daemon=True
+            )
+            self._writer.start()
+            atexit.register(self.close)
+
         # Initialize input and output guardrails
         try:
             from .input_guardrail import InputGuardrail
@@ -89,7 +135,7 @@ class SafetyManager:
                 if not is_safe and self.log_events:
                     self._log_safety_event(
                         event_type="input_violation",
-                        content=query,
+                        content=_preview(query),
                         violations=violations,
                         is_safe=is_safe
                     )
@@ -108,17 +154,6 @@ class SafetyManager:
             self.logger.warning("Input guardrail not available, allowing query")
             return {"safe": True, "violations": []}
 
-        is_safe = len(violations) == 0
-
-        # Log safety event
-        if not is_safe and self.log_events:
-            self._log_safety_event("input", query, violations, is_safe)
-
-        return {
-            "safe": is_safe,
-            "violations": violations
-        }
-
     def check_output_safety(
         self,
         response: str,
@@ -150,7 +185,7 @@ class SafetyManager:
                 if not is_safe and self.log_events:
                     self._log_safety_event(
                         event_type="output_violation",
-                        content=response[:200],  # Log first 200 chars
+                        content=_preview(response),
                         violations=violations,
                         is_safe=is_safe
                     )
@@ -208,8 +243,8 @@ class SafetyManager:
         Log a safety event.
 
         Args:
-            event_type: "input" or "output"
-            content: The content that was checked
+            event_type: "input_violation" or "output_violation" (counted by its prefix)
+            content: Preview of the content that was checked (see _preview)
             violations: List of violations found
             is_safe: Whether content passed safety checks
         """
@@ -218,24 +253,114 @@ class SafetyManager:
             "type": event_type,
             "safe": is_safe,
             "violations": violations,
-            "content_preview": content[:100] + "..." if len(content) > 100 else content
+            "content_preview": content
         }
 
-        self.safety_events.append(event)
+        with self._events_lock:
+            self.safety_events.append(event)
+            self._event_counts["total"] += 1
+            self._event_counts[event_type.split("_", 1)[0]] += 1
+            if not is_safe:
+                self._event_counts["violations"] += 1
         self.logger.warning(f"Safety event: {event_type} - safe={is_safe}")
 
-        # Write to safety log file if configured
-        log_file = self.config.get("safety_log_file")
-        if log_file and self.log_events:
+        # Queue for the safety log writer if configured; drop rather than
+        # block the request when the writer has fallen behind. Once close()
+        # has stopped the writer, events are written directly. The lock keeps
+        # an event from landing on the queue after close()'s stop sentinel
+        with self._log_lock:
+            if self._event_queue is not None:
+                try:
+                    self._event_queue.put_nowait(event)
+                except queue.Full:
+                    self.logger.error("Safety log queue full, dropping event")
+            elif self._log_file:
+                try:
+                    with self._open_log() as log_fh:
+                        log_fh.write(json.dumps(event) + "\n")
+                except Exception as e:
+                    self.logger.error(f"Failed to write safety log: {e}")
+
+    def _open_log(self):
+        """
+        Open the safety log file for appending. A .gz log file is written as
+        an appended gzip stream at the cheapest compression level.
+        """
+        if self._log_file.endswith(".gz"):
+            return gzip.open(self._log_file, "at", compresslevel=1, encoding="utf-8")
+        return open(self._log_file, "a", buffering=64 * 1024)
+
+    def _event_writer_loop(self, event_queue: queue.Queue):
+        """Write queued safety events to the log file in batches until close()."""
+        # One buffered handle for the writer's lifetime instead of an
+        # open/close per write; flushed after every batch
+        try:
+            log_fh = self._open_log()
+        except OSError as e:
+            self.logger.error(f"Failed to open safety log: {e}")
+            log_fh = None
+
+        try:
+            while True:
+                batch, stop = self._next_event_batch(event_queue)
+                if batch and log_fh is not None:
+                    try:
+                        log_fh.write("".join(json.dumps(e) + "\n" for e in batch))
+                        log_fh.flush()
+                    except Exception as e:
+                        self.logger.error(f"Failed to write safety log: {e}")
+                if stop:
+                    return
+        finally:
+            if log_fh is not None:
+                log_fh.close()
+
+    def _next_event_batch(self, event_queue: queue.Queue):
+        """
+        Wait for queued events and collect a batch: up to _LOG_BATCH_SIZE
+        events, or whatever arrives within _LOG_BATCH_WINDOW.
+
+        Returns:
+            Tuple of (events, whether close() was requested)
+        """
+        event = event_queue.get()
+        if event is None:
+            return [], True
+
+        batch = [event]
+        deadline = time.monotonic() + _LOG_BATCH_WINDOW
+        while len(batch) < _LOG_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
             try:
-                with open(log_file, "a") as f:
-                    f.write(json.dumps(event) + "\n")
-            except Exception as e:
-                self.logger.error(f"Failed to write safety log: {e}")
+                event = event_queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if event is None:
+                return batch, True
+            batch.append(event)
+        return batch, False
+
+    def close(self):
+        """
+        Flush queued safety events to the log file and stop the writer thread.
+        Events logged afterwards are written to the log file directly.
+        """
+        # Under the log lock, so no event is queued behind the sentinel and
+        # events logged meanwhile are written after the queued ones
+        with self._log_lock:
+            if self._writer is None:
+                return
+            event_queue, self._event_queue = self._event_queue, None
+            event_queue.put(None)
+            self._writer.join(timeout=5)
+            self._writer = None
 
     def get_safety_events(self) -> List[Dict[str, Any]]:
-        """Get all logged safety events."""
-        return self.safety_events
+        """Get the logged safety events (the most recent max_events)."""
+        with self._events_lock:
+            return list(self.safety_events)
 
     def get_safety_stats(self) -> Dict[str, Any]:
         """
@@ -244,10 +369,11 @@ class SafetyManager:
         Returns:
             Dictionary with safety statistics
         """
-        total = len(self.safety_events)
-        input_events = sum(1 for e in self.safety_events if e["type"] == "input")
-        output_events = sum(1 for e in self.safety_events if e["type"] == "output")
-        violations = sum(1 for e in self.safety_events if not e["safe"])
+        with self._events_lock:
+            total = self._event_counts["total"]
+            input_events = self._event_counts["input"]
+            output_events = self._event_counts["output"]
+            violations = self._event_counts["violations"]
 
         return {
             "total_events": total,
@@ -259,4 +385,6 @@ class SafetyManager:
 
     def clear_events(self):
         """Clear safety event log."""
-        self.safety_events = []
+        with self._events_lock:
+            self.safety_events.clear()
+            self._event_counts.clear()
@@ -0,0 +1,57 @@
+"""
+Shared HTTP Client
+One pooled httpx.AsyncClient per event loop for model and tool HTTP calls.
+
+Reusing a client keeps TCP/TLS connections alive between agent turns and
+queries instead of opening a new connection per request. HTTP/2 is enabled
+when the h2 package is installed, so concurrent requests to the same host
+(e.g. parallel tool calls) share one connection.
+
+httpx clients cannot be used across event loops, so the client is keyed by
+the running loop and dropped together with it.
+
+Example usage:
+    from src.http import get_http_client
+    response = await get_http_client().get(url, params=params)
+"""
+
+import asyncio
+import importlib.util
+import weakref
+
+import httpx
+
+
+# Whether HTTP/2 support (the h2 package) is installed
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for the running event loop, creating it on first use.
+
+    Must be called from inside a coroutine.
+
+    Returns:
+        Pooled httpx.AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(http2=_HTTP2, limits=_LIMITS, timeout=_TIMEOUT)
+        _clients[loop] = client
+    return client
+
+
+async def aclose_http_client():
+    """Close the running event loop's shared HTTP client, if any."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
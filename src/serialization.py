@@ -0,0 +1,91 @@
+"""
+JSON Serialization
+Encodes and parses the JSON files under outputs/ and data/.
+
+Uses orjson when it is installed (serializes dataclasses, numpy arrays and
+datetimes in C) and falls back to the standard library json module.
+Objects neither encoder understands, such as AutoGen messages, are converted
+by _default instead of being walked up front.
+
+Example usage:
+    from src.serialization import dumps, loads, write_json
+    await write_json("outputs/session.json", session_data)
+    queries = loads(Path("data/example_queries.json").read_bytes())
+"""
+
+from typing import Any, Union
+import asyncio
+import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Convert an object the JSON encoder does not support natively."""
+    if hasattr(obj, "model_dump"):
+        # Pydantic models (e.g. AutoGen messages and function calls)
+        return {"_type": obj.__class__.__name__, **obj.model_dump()}
+    if hasattr(obj, "__dict__"):
+        # Preserve public attributes of plain objects
+        return {
+            "_type": obj.__class__.__name__,
+            **{k: v for k, v in obj.__dict__.items() if not k.startswith("_")},
+        }
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # Last resort: string representation
+    return str(obj)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON.
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+    return json.dumps(
+        obj, default=_default, indent=2 if indent else None, ensure_ascii=False
+    ).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: JSON document as bytes or str
+
+    Returns:
+        Parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+async def write_json(path: str, obj: Any, indent: bool = False):
+    """
+    Serialize an object and write it to a file without blocking the event loop.
+
+    Args:
+        path: Output file path
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation
+    """
+    data = dumps(obj, indent=indent)
+    await asyncio.to_thread(Path(path).write_bytes, data)
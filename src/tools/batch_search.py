@@ -0,0 +1,79 @@
+"""
+Batch Search Tool
+Runs several web and paper searches concurrently in a single tool call.
+
+The Researcher usually needs results for every sub-query in the Planner's
+plan. Issuing them one tool call at a time costs one network round trip per
+search; this tool fans them all out with asyncio.gather so the whole batch
+completes in roughly the time of the slowest search.
+"""
+
+from typing import List, Optional
+import asyncio
+import logging
+
+from .web_search import WebSearchTool, format_web_results
+from .paper_search import PaperSearchTool, format_paper_results
+
+
+logger = logging.getLogger("tools.batch_search")
+
+
+async def batch_search(
+    queries: List[str],
+    year_from: Optional[int] = None,
+    max_results: int = 3,
+    include_web: bool = True,
+    include_papers: bool = True
+) -> str:
+    """
+    Search the web and academic papers for several queries at once.
+
+    Args:
+        queries: Search queries (e.g. the sub-questions from the research plan)
+        year_from: Only return papers from this year onwards
+        max_results: Maximum results per query and per source
+        include_web: Whether to run web searches
+        include_papers: Whether to run paper searches
+
+    Returns:
+        Formatted string with the results for every query, grouped by query
+    """
+    # Drop blanks and exact repeats while keeping the planner's order
+    queries = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+    if not queries:
+        return "No search queries provided."
+
+    logger.info(f"Running batch search for {len(queries)} queries")
+
+    web_tool = WebSearchTool(max_results=max_results) if include_web else None
+    paper_tool = PaperSearchTool(max_results=max_results) if include_papers else None
+
+    searches = []
+    for query in queries:
+        if web_tool:
+            searches.append(web_tool.search(query))
+        if paper_tool:
+            searches.append(paper_tool.search(query, year_from=year_from))
+
+    # Both tools already swallow their own errors, but keep one failing
+    # search from discarding the rest of the batch
+    results = iter(await asyncio.gather(*searches, return_exceptions=True))
+
+    sections = []
+    for query in queries:
+        sections.append(f"=== Results for '{query}' ===\n")
+        if web_tool:
+            web_results = next(results)
+            if isinstance(web_results, Exception):
+                logger.error(f"Web search failed for '{query}': {web_results}")
+                web_results = []
+            sections.append(format_web_results(query, web_results))
+        if paper_tool:
+            paper_results = next(results)
+            if isinstance(paper_results, Exception):
+                logger.error(f"Paper search failed for '{query}': {paper_results}")
+                paper_results = []
+            sections.append(format_paper_results(query, paper_results))
+
+    return "\n".join(sections)
@@ -284,10 +284,13 @@ class PaperSearchTool:
         return [p for p in papers if p.get("citation_count", 0) >= min_citations]
 
 
-# Synchronous wrapper for use with AutoGen tools
-def paper_search(query: str, max_results: int = 10, year_from: Optional[int] = None) -> str:
+# Tool function for use with AutoGen
+async def paper_search(query: str, max_results: int = 10, year_from: Optional[int] = None) -> str:
     """
-    Synchronous wrapper for paper search (for AutoGen tool integration).
+    Paper search tool function for AutoGen.
+
+    A coroutine, so it runs on the team's event loop rather than starting a
+    new loop per call.
     
     Args:
         query: Search query
@@ -298,8 +301,21 @@ def paper_search(query: str, max_results: int = 10, year_from: Optional[int] = N
         Formatted string with paper results
     """
     tool = PaperSearchTool(max_results=max_results)
-    results = asyncio.run(tool.search(query, year_from=year_from))
+    results = await tool.search(query, year_from=year_from)
+    return format_paper_results(query, results)
+
+
+def format_paper_results(query: str, results: List[Dict[str, Any]]) -> str:
+    """
+    Format paper search results as readable text for the agents.
     
+    Args:
+        query: Search query the results belong to
+        results: Papers as returned by PaperSearchTool.search
+        
+    Returns:
+        Formatted string with paper results
+    """
     if not results:
         return "No academic papers found."
     
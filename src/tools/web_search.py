@@ -97,8 +97,10 @@ class WebSearchTool:
             include_domains = kwargs.get("include_domains", [])
             exclude_domains = kwargs.get("exclude_domains", [])
             
-            # Perform search
-            response = client.search(
+            # TavilyClient is blocking; run it in a worker thread so concurrent
+            # searches on the same event loop overlap their network I/O
+            response = await asyncio.to_thread(
+                client.search,
                 query=query,
                 max_results=self.max_results,
                 search_depth=search_depth,
@@ -122,12 +124,11 @@ class WebSearchTool:
         Brave Search is a privacy-focused alternative to Google.
         """
         try:
-            import aiohttp
+            from src.http import get_http_client
             
             url = "https://api.search.brave.com/res/v1/web/search"
             headers = {
                 "Accept": "application/json",
-                "Accept-Encoding": "gzip",
                 "X-Subscription-Token": self.api_key,
             }
             params = {
@@ -135,18 +136,14 @@ class WebSearchTool:
                 "count": self.max_results,
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._parse_brave_results(data)
-                    else:
-                        self.logger.error(f"Brave API error: {response.status}")
-                        return []
+            # Shared pooled client; httpx negotiates gzip itself
+            response = await get_http_client().get(url, headers=headers, params=params)
+            if response.status_code == 200:
+                return self._parse_brave_results(response.json())
+            else:
+                self.logger.error(f"Brave API error: {response.status_code}")
+                return []
                         
-        except ImportError:
-            self.logger.error("aiohttp not installed. Run: pip install aiohttp")
-            return []
         except Exception as e:
             self.logger.error(f"Brave search error: {e}")
             return []
@@ -211,10 +208,13 @@ class WebSearchTool:
         return [r for r in results if r.get("score", 0) >= min_score]
 
 
-# Synchronous wrapper for use with AutoGen tools
-def web_search(query: str, provider: str = "tavily", max_results: int = 5) -> str:
+# Tool function for use with AutoGen
+async def web_search(query: str, provider: str = "tavily", max_results: int = 5) -> str:
     """
-    Synchronous wrapper for web search (for AutoGen tool integration).
+    Web search tool function for AutoGen.
+
+    A coroutine, so it runs on the team's event loop and shares that loop's
+    pooled HTTP client (see src.http) instead of a throwaway loop per call.
     
     Args:
         query: Search query
@@ -225,8 +225,21 @@ def web_search(query: str, provider: str = "tavily", max_results: int = 5) -> st
         Formatted string with search results
     """
     tool = WebSearchTool(provider=provider, max_results=max_results)
-    results = asyncio.run(tool.search(query))
+    results = await tool.search(query)
+    return format_web_results(query, results)
+
+
+def format_web_results(query: str, results: List[Dict[str, Any]]) -> str:
+    """
+    Format web search results as readable text for the agents.
     
+    Args:
+        query: Search query the results belong to
+        results: Results as returned by WebSearchTool.search
+        
+    Returns:
+        Formatted string with search results
+    """
     if not results:
         return "No search results found."
     
@@ -6,28 +6,56 @@ Interactive CLI for the multi-agent research system.
 import sys
 from pathlib import Path
 
-# Add project root to Python path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
-import asyncio
-from typing import Dict, Any
-import yaml
-import json
+# Add project root to Python path when run as a script (python src/ui/cli.py);
+# not needed when imported as part of the src package
+if "src" not in sys.modules:
+    project_root = Path(__file__).parent.parent.parent
+    sys.path.insert(0, str(project_root))
+
+from typing import Dict, Any, Optional
+import io
 import logging
-from dotenv import load_dotenv
+import re
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlsplit
 
+from src.config import get_config
+from src.serialization import dumps
 from src.autogen_orchestrator import AutoGenOrchestrator
 from src.tools.citation_tool import CitationTool
 
-# Load environment variables
-load_dotenv()
-
 # Ensure outputs directory exists
 Path("outputs").mkdir(exist_ok=True)
 
+# Message sources that are research team agents (the rest are the user)
+_AGENT_ROLES = frozenset({"Planner", "Researcher", "Writer", "Critic"})
+
+# URLs cited in agent messages
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+
+# Citations listed per result; extraction stops scanning once reached
+_MAX_CITATIONS = 10
+
+
+def _join_items(items) -> str:
+    """Join multi-part message content into one string."""
+    return " ".join(str(item) for item in items)
+
+
+# Converters from message content types to display text; any other type,
+# including str (returned as is), goes through str()
+_TEXT_CONVERTERS = {
+    list: _join_items,
+    tuple: _join_items,
+}
+
+
+def _as_text(content: Any) -> str:
+    """Normalize message content (str, list of parts, or other) to text."""
+    return _TEXT_CONVERTERS.get(type(content), str)(content)
+
+
 class CLI:
     """
     Command-line interface for the research assistant.
@@ -48,9 +76,8 @@ class CLI:
         Args:
             config_path: Path to configuration file
         """
-        # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Load configuration (environment variables are loaded by src.config)
+        self.config = get_config(config_path)
 
         # Setup logging
         self._setup_logging()
@@ -82,7 +109,7 @@ class CLI:
             format=log_format
         )
 
-    async def run(self):
+    def run(self):
         """
         Main CLI loop.
 
@@ -123,19 +150,23 @@ class CLI:
                 print("=" * 70)
                 
                 try:
-                    # Process through orchestrator (synchronous call, not async)
-                    result = self.orchestrator.process_query(query)
+                    # The sync shim keeps one event loop across queries, so the
+                    # research team is reused
+                    result = self.orchestrator.process_query_sync(query)
                     self.query_count += 1
                     
+                    # Extracted once, for both the session file and the display
+                    citations = self._extract_citations(result)
+                    
                     # Save session to JSON file
                     try:
-                        session_file = self._save_session_json(query, result)
+                        session_file = self._save_session_json(query, result, citations)
                         print(f"\n✅ Session saved to: {session_file}")
                     except Exception as e:
                         print(f"\n⚠️  Could not save session file: {e}")
                     
                     # Display result
-                    self._display_result(result)
+                    self._display_result(result, citations)
                     
                 except Exception as e:
                     print(f"\nError processing query: {e}")
@@ -185,67 +216,68 @@ class CLI:
         print(f"  Topic: {self.config.get('system', {}).get('topic', 'Unknown')}")
         print(f"  Model: {self.config.get('models', {}).get('default', {}).get('name', 'Unknown')}")
 
-    def _display_result(self, result: Dict[str, Any]):
-        """Display query result with formatting."""
-        print("\n" + "=" * 70)
-        print("RESPONSE")
-        print("=" * 70)
+    def _display_result(self, result: Dict[str, Any], citations: Optional[list] = None):
+        """Display query result with formatting (citations are extracted if not given)."""
+        # Built in memory and written to stdout at once, so a long response
+        # is encoded and written once rather than per print()
+        out = io.StringIO()
+        self._format_result(result, citations, out)
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+
+    def _format_result(self, result: Dict[str, Any], citations: Optional[list], out):
+        """Write the formatted query result to out."""
+        print("\n" + "=" * 70, file=out)
+        print("RESPONSE", file=out)
+        print("=" * 70, file=out)
 
         # Check for errors
         if "error" in result:
-            print(f"\n❌ Error: {result['error']}")
+            print(f"\n❌ Error: {result['error']}", file=out)
             return
 
         # Display response
-        response = result.get("response", "")
-        # Handle response being a list or other non-string type
-        if isinstance(response, list):
-            response = " ".join(str(item) for item in response)
-        elif not isinstance(response, str):
-            response = str(response)
-        print(f"\n{response}\n")
+        response = _as_text(result.get("response", ""))
+        print(f"\n{response}\n", file=out)
 
         # Extract and display citations from conversation in APA format
-        citations = self._extract_citations(result)
+        if citations is None:
+            citations = self._extract_citations(result)
         if citations:
-            print("\n" + "-" * 70)
-            print("📚 CITATIONS (APA Format)")
-            print("-" * 70)
+            print("\n" + "-" * 70, file=out)
+            print("📚 CITATIONS (APA Format)", file=out)
+            print("-" * 70, file=out)
             for i, citation_data in enumerate(citations, 1):
                 if isinstance(citation_data, dict):
-                    print(f"[{i}] {citation_data.get('formatted', citation_data.get('url', ''))}")
+                    print(f"[{i}] {citation_data.get('formatted', citation_data.get('url', ''))}", file=out)
                 else:
-                    print(f"[{i}] {citation_data}")
+                    print(f"[{i}] {citation_data}", file=out)
 
         # Display metadata
         metadata = result.get("metadata", {})
         if metadata:
-            print("\n" + "-" * 70)
-            print("📊 METADATA")
-            print("-" * 70)
-            print(f"  • Messages exchanged: {metadata.get('num_messages', 0)}")
-            print(f"  • Sources gathered: {metadata.get('num_sources', 0)}")
-            print(f"  • Agents involved: {', '.join(metadata.get('agents_involved', []))}")
+            print("\n" + "-" * 70, file=out)
+            print("📊 METADATA", file=out)
+            print("-" * 70, file=out)
+            print(f"  • Messages exchanged: {metadata.get('num_messages', 0)}", file=out)
+            print(f"  • Sources gathered: {metadata.get('num_sources', 0)}", file=out)
+            print(f"  • Agents involved: {', '.join(metadata.get('agents_involved', []))}", file=out)
 
         # Display conversation summary if verbose mode
         if self._should_show_traces():
-            self._display_conversation_summary(result.get("conversation_history", []))
+            self._display_conversation_summary(result.get("conversation_history", []), out)
 
-        print("=" * 70 + "\n")
+        print("=" * 70 + "\n", file=out)
     
-    def _save_session_json(self, query: str, result: Dict[str, Any]) -> str:
-        """Save session data to JSON file in outputs folder."""
+    def _save_session_json(
+        self, query: str, result: Dict[str, Any], citations: Optional[list] = None
+    ) -> str:
+        """Save session data to JSON file in outputs folder (citations are extracted if not given)."""
+        if citations is None:
+            citations = self._extract_citations(result)
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        def make_serializable(obj):
-            if isinstance(obj, (str, int, float, bool, type(None))):
-                return obj
-            if isinstance(obj, (list, tuple)):
-                return [make_serializable(i) for i in obj]
-            if isinstance(obj, dict):
-                return {k: make_serializable(v) for k, v in obj.items()}
-            return str(obj)
-        
         formatted_history = []
         for i, msg in enumerate(result.get("metadata", {}).get("conversation_history", [])):
             if isinstance(msg, dict):
@@ -257,9 +289,9 @@ class CLI:
             
             formatted_history.append({
                 "index": i,
-                "role": "assistant" if source in ["Planner", "Researcher", "Writer", "Critic"] else "user",
+                "role": "assistant" if source in _AGENT_ROLES else "user",
                 "name": source,
-                "content": str(content) if not isinstance(content, str) else content
+                "content": _as_text(content)
             })
         
         session_data = {
@@ -267,48 +299,45 @@ class CLI:
             "timestamp": datetime.now().isoformat(),
             "conversation_history": formatted_history,
             "response": result.get("response", ""),
-            "metadata": make_serializable(result.get("metadata", {})),
-            "citations": self._extract_citations(result)
+            # Non-JSON values in metadata are converted by the encoder
+            "metadata": result.get("metadata", {}),
+            "citations": citations
         }
         
         session_file = f"outputs/cli_session_{timestamp}.json"
-        with open(session_file, 'w', encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2, ensure_ascii=False)
+        Path(session_file).write_bytes(dumps(session_data, indent=True))
         
         return session_file
     
     def _extract_citations(self, result: Dict[str, Any]) -> list:
         """Extract citations/URLs from conversation history and format in APA style."""
-        import re
         citations = []
         seen_urls = set()
+        year = datetime.now().year
         
         for msg in result.get("conversation_history", []):
+            if len(citations) >= _MAX_CITATIONS:
+                break
             content = msg.get("content", "")
             
-            # Handle content being a list or other non-string type
-            if isinstance(content, list):
-                content = " ".join(str(item) for item in content)
-            elif not isinstance(content, str):
-                content = str(content)
-            
-            # Find URLs in content
-            urls = re.findall(r'https?://[^\s<>"{}|\\^`\[\]]+', content)
+            content = _as_text(content)
             
-            for url in urls:
-                if url not in seen_urls and len(citations) < 10:
-                    seen_urls.add(url)
-                    # Simple APA format: Site name. (Year). URL
-                    try:
-                        site_name = url.split('/')[2]
-                    except:
-                        site_name = "Web Source"
-                    
-                    formatted = f"{site_name}. ({datetime.now().year}). Retrieved from {url}"
-                    citations.append({
-                        "url": url,
-                        "formatted": formatted
-                    })
+            # Find URLs in content (lazily, so the cap stops the scan)
+            for match in _URL_RE.finditer(content):
+                url = match.group()
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                # Simple APA format: Site name. (Year). URL
+                site_name = urlsplit(url).netloc or "Web Source"
+                
+                formatted = f"{site_name}. ({year}). Retrieved from {url}"
+                citations.append({
+                    "url": url,
+                    "formatted": formatted
+                })
+                if len(citations) >= _MAX_CITATIONS:
+                    break
         
         return citations
 
@@ -317,31 +346,28 @@ class CLI:
         # Check config for verbose mode
         return self.config.get("ui", {}).get("verbose", False)
 
-    def _display_conversation_summary(self, conversation_history: list):
-        """Display a summary of the agent conversation."""
+    def _display_conversation_summary(self, conversation_history: list, out=None):
+        """Display a summary of the agent conversation (on out, default stdout)."""
         if not conversation_history:
             return
             
-        print("\n" + "-" * 70)
-        print("🔍 CONVERSATION SUMMARY")
-        print("-" * 70)
+        print("\n" + "-" * 70, file=out)
+        print("🔍 CONVERSATION SUMMARY", file=out)
+        print("-" * 70, file=out)
         
         for i, msg in enumerate(conversation_history, 1):
             agent = msg.get("source", "Unknown")
             content = msg.get("content", "")
             
-            # Handle content being a list or other non-string type
-            if isinstance(content, list):
-                content = " ".join(str(item) for item in content)
-            elif not isinstance(content, str):
-                content = str(content)
+            content = _as_text(content)
             
             # Truncate long content
-            preview = content[:150] + "..." if len(content) > 150 else content
-            preview = preview.replace("\n", " ")
+            preview = content[:150].replace("\n", " ")
+            if len(content) > 150:
+                preview += "..."
             
-            print(f"\n{i}. {agent}:")
-            print(f"   {preview}")
+            print(f"\n{i}. {agent}:", file=out)
+            print(f"   {preview}", file=out)
 
 
 def main():
@@ -361,7 +387,7 @@ def main():
 
     # Run CLI
     cli = CLI(config_path=args.config)
-    asyncio.run(cli.run())
+    cli.run()
 
 
 if __name__ == "__main__":
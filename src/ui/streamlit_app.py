@@ -13,47 +13,104 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 import streamlit as st
-import asyncio
-import yaml
 import json
+import re
+import time
 from datetime import datetime
-from typing import Dict, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, Tuple
 from pathlib import Path
-from dotenv import load_dotenv
+from urllib.parse import urlsplit
 
-from src.autogen_orchestrator import AutoGenOrchestrator
-from src.tools.citation_tool import CitationTool
+from src.config import get_config
 
-# Load environment variables
-load_dotenv()
+# The orchestrator (and what it imports) is loaded on first use by
+# get_orchestrator, not at worker startup
+if TYPE_CHECKING:
+    from src.autogen_orchestrator import AutoGenOrchestrator
 
 # Ensure outputs directory exists
 Path("outputs").mkdir(exist_ok=True)
 
+# URLs cited in agent messages (length-bounded so a pathological token
+# cannot make a single match run away)
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]{1,2048}')
+
+# Citations listed per result; the URL scan stops once reached
+_MAX_CITATIONS = 10
+
+# Minimum seconds between redraws of the live token preview (20 Hz), so
+# per-token events don't each cost a render round-trip
+_LIVE_UPDATE_INTERVAL = 0.05
+
+# Agent trace steps rendered at first, and per "Show earlier steps" click
+_TRACE_PAGE = 10
+
+# Queries listed in the history at first, and per "Show earlier queries" click
+_HISTORY_PAGE = 20
+
+# Research team agents in workflow order: (emoji, in-progress text, done text)
+_AGENT_STEPS = {
+    "Planner": ("📋", "Creating research plan...", "Plan created"),
+    "Researcher": ("🔍", "Gathering sources...", "Sources gathered"),
+    "Writer": ("✍️", "Synthesizing response...", "Response synthesized"),
+    "Critic": ("⚖️", "Verifying quality...", "Quality verified"),
+}
+
+_AGENT_EMOJI = {agent: emoji for agent, (emoji, _, _) in _AGENT_STEPS.items()}
+
+# Final status row once every agent is done
+_AGENTS_DONE_HTML = "<div style='display:flex;gap:1em'>{}</div>".format("".join(
+    f"<div style='flex:1'>{emoji} <b>{agent}</b><br>✓ {done}</div>"
+    for agent, (emoji, _, done) in _AGENT_STEPS.items()
+))
+
 
 def load_config():
     """Load configuration file."""
     config_path = Path("config.yaml")
     if config_path.exists():
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+        return get_config(str(config_path))
     return {}
 
 
+@st.cache_resource(show_spinner="Initializing orchestrator...")
+def get_orchestrator(config_mtime: float) -> "AutoGenOrchestrator":
+    """
+    Get the orchestrator shared by all sessions, so its research teams, API
+    clients and result cache are built once per server rather than per
+    browser session.
+
+    Args:
+        config_mtime: Modification time of config.yaml; only part of the
+            cache key, so the orchestrator is rebuilt when the file changes
+    """
+    from src.autogen_orchestrator import AutoGenOrchestrator
+
+    return AutoGenOrchestrator(load_config())
+
+
 def initialize_session_state():
     """Initialize Streamlit session state."""
     if 'history' not in st.session_state:
         st.session_state.history = []
 
     if 'orchestrator' not in st.session_state:
-        config = load_config()
+        config_path = Path("config.yaml")
+        config_mtime = config_path.stat().st_mtime if config_path.exists() else 0.0
         # Initialize AutoGen orchestrator
         try:
-            st.session_state.orchestrator = AutoGenOrchestrator(config)
+            st.session_state.orchestrator = get_orchestrator(config_mtime)
         except Exception as e:
             st.error(f"Failed to initialize orchestrator: {e}")
             st.session_state.orchestrator = None
 
+    if 'system_name' not in st.session_state:
+        # Read once per session for the sidebar's About section
+        system = load_config().get("system", {})
+        st.session_state.system_name = system.get("name", "Research Assistant")
+        st.session_state.topic = system.get("topic", "General")
+
     if 'show_traces' not in st.session_state:
         st.session_state.show_traces = False
 
@@ -84,43 +141,62 @@ def process_query(query: str, status_placeholder=None) -> Dict[str, Any]:
         }
     
     try:
-        # Show agent workflow status
+        # Show agent workflow status, updated from the orchestrator's events
+        # as each agent starts and finishes
+        agent_slots = {}
+        live_output = None
         if status_placeholder:
             with status_placeholder.container():
                 st.info("🔄 **Multi-Agent Processing Active**")
-                agent_status = st.empty()
-                
-                # Update status for each expected agent
-                agent_status.markdown("📋 **Planner**: Creating research plan...")
-                import time
-                time.sleep(0.5)
+                for col, agent in zip(st.columns(len(_AGENT_STEPS)), _AGENT_STEPS):
+                    agent_slots[agent] = col.empty()
+                    show_agent_status(agent_slots[agent], agent, "waiting")
+                live_output = st.empty()
         
         # Process query through AutoGen orchestrator
-        result = orchestrator.process_query(query)
+        result = None
+        active_agent = None
+        streamed = {}
+        last_update = 0.0
+        for event in orchestrator.stream_query_sync(query):
+            if event["type"] == "result":
+                result = event["result"]
+                continue
+            if not agent_slots:
+                continue
+            
+            agent = event["source"]
+            if agent in agent_slots and agent != active_agent:
+                if active_agent is not None:
+                    show_agent_status(agent_slots[active_agent], active_agent, "done")
+                show_agent_status(agent_slots[agent], agent, "working")
+                active_agent = agent
+            
+            # Streamed tokens are previewed live, redrawn at most every
+            # _LIVE_UPDATE_INTERVAL; a complete message ends the preview and
+            # flushes whatever was coalesced since the last redraw
+            if event["type"] == "chunk":
+                streamed[agent] = streamed.get(agent, "") + event["content"]
+                now = time.monotonic()
+                if now - last_update >= _LIVE_UPDATE_INTERVAL:
+                    live_output.markdown(f"**{agent}:** {streamed[agent]}")
+                    last_update = now
+            elif agent in streamed:
+                live_output.markdown(f"**{agent}:** {streamed.pop(agent)}")
+                last_update = time.monotonic()
         
-        # Update status during processing (simplified version)
         if status_placeholder:
             with status_placeholder.container():
                 st.success("✅ **Processing Complete**")
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.markdown("📋 **Planner**\n✓ Plan created")
-                with col2:
-                    st.markdown("🔍 **Researcher**\n✓ Sources gathered")
-                with col3:
-                    st.markdown("✍️ **Writer**\n✓ Response synthesized")
-                with col4:
-                    st.markdown("⚖️ **Critic**\n✓ Quality verified")
+                # One element for the final row rather than a column per agent
+                st.markdown(_AGENTS_DONE_HTML, unsafe_allow_html=True)
         
         # Check for errors
         if "error" in result:
             return result
         
-        # Extract citations from conversation history
-        citations = extract_citations(result)
-        
-        # Extract agent traces for display
-        agent_traces = extract_agent_traces(result)
+        # Extract citations and agent traces for display from conversation history
+        citations, agent_traces = extract_citations_and_traces(result)
         
         # Format metadata
         metadata = result.get("metadata", {})
@@ -145,67 +221,78 @@ def process_query(query: str, status_placeholder=None) -> Dict[str, Any]:
         }
 
 
-def extract_citations(result: Dict[str, Any]) -> list:
-    """Extract citations from research result and format in APA style."""
-    import re
-    citations = []
-    seen_urls = set()
-    
-    # Look through conversation history for citations
-    for msg in result.get("conversation_history", []):
-        content = msg.get("content", "")
-        
-        # Handle content being a list or other non-string type
-        if isinstance(content, list):
-            content = " ".join(str(item) for item in content)
-        elif not isinstance(content, str):
-            content = str(content)
-        
-        # Find URLs in content
-        urls = re.findall(r'https?://[^\s<>"{}|\\^`\[\]]+', content)
-        
-        # Quick APA-style formatting
-        for url in urls:
-            if url not in seen_urls and len(citations) < 10:
-                seen_urls.add(url)
-                # Simple APA format: Site name. (Year). URL
-                try:
-                    site_name = url.split('/')[2]
-                except:
-                    site_name = "Web Source"
-                
-                formatted = f"{site_name}. ({datetime.now().year}). Retrieved from {url}"
-                citations.append({
-                    "url": url,
-                    "formatted": formatted
-                })
-    
-    return citations
+def show_agent_status(slot, agent: str, state: str):
+    """Render an agent's progress ("waiting", "working" or "done") into a placeholder."""
+    emoji, working, done = _AGENT_STEPS[agent]
+    if state == "working":
+        slot.markdown(f"{emoji} **{agent}**\n⏳ {working}")
+    elif state == "done":
+        slot.markdown(f"{emoji} **{agent}**\n✓ {done}")
+    else:
+        slot.markdown(f"{emoji} **{agent}**\n…")
+
+
+def _as_text(content: Any) -> str:
+    """Normalize message content (str, list of parts, or other) to text."""
+    if type(content) is str:  # the common case
+        return content
+    if isinstance(content, list):
+        return " ".join(map(str, content))
+    return str(content)
+
 
+@lru_cache(maxsize=1024)
+def _site_name(url: str) -> str:
+    """Site name for a cited URL (its host), memoized as sources repeat across queries."""
+    return urlsplit(url).netloc or "Web Source"
 
-def extract_agent_traces(result: Dict[str, Any]) -> list:
-    """Extract agent execution traces from conversation history with better formatting."""
+
+def extract_citations_and_traces(result: Dict[str, Any]) -> Tuple[list, list]:
+    """
+    Extract citations (formatted in APA style) and agent execution traces
+    from the conversation history in a single pass.
+
+    Returns:
+        Tuple of (citations, traces)
+    """
+    citations = []
     traces = []
+    seen_urls = set()
+    year = datetime.now().year
     
     for i, msg in enumerate(result.get("conversation_history", []), 1):
         agent = msg.get("source", "Unknown")
         content = msg.get("content", "")
         
-        # Handle content being a list or other non-string type
-        if isinstance(content, list):
-            content = " ".join(str(item) for item in content)
-        elif not isinstance(content, str):
-            content = str(content)
+        content = _as_text(content)
         
-        # Create trace entry with step number, agent, and preview
+        # Create trace entry with step number and agent; the preview is cut
+        # from full_content only for the steps display_agent_traces renders
         traces.append({
             "step": i,
             "agent": agent,
-            "preview": content[:300] + "..." if len(content) > 300 else content,
             "full_content": content
         })
+        
+        # Find URLs in content, with quick APA-style formatting; once the
+        # citations are full only the traces need the remaining messages
+        if len(citations) >= _MAX_CITATIONS:
+            continue
+        for match in _URL_RE.finditer(content):
+            url = match.group()
+            if url in seen_urls:
+                continue
+            seen_urls.add(url)
+            # Simple APA format: Site name. (Year). URL
+            formatted = f"{_site_name(url)}. ({year}). Retrieved from {url}"
+            citations.append({
+                "url": url,
+                "formatted": formatted
+            })
+            if len(citations) >= _MAX_CITATIONS:
+                break
     
-    return traces
+    return citations, traces
 
 
 def calculate_quality_score(result: Dict[str, Any]) -> float:
@@ -304,27 +391,24 @@ def display_response(result: Dict[str, Any]):
     # Display response
     st.markdown("### Response")
     response = result.get("response", "")
-    # Handle response being a list or other non-string type
-    if isinstance(response, list):
-        response = " ".join(str(item) for item in response)
-    elif not isinstance(response, str):
-        response = str(response)
-    st.markdown(response)
+    st.markdown(_as_text(response))
 
-    # Display citations in APA format
     metadata = result.get("metadata", {})
+
+    # Display citations in APA format
     citations = metadata.get("citations_formatted", [])
     if citations:
         with st.expander("📚 Citations (APA Format)", expanded=False):
+            # One markdown element for the whole list
+            lines = []
             for i, citation_data in enumerate(citations, 1):
                 if isinstance(citation_data, dict):
-                    st.markdown(f"**[{i}]** {citation_data.get('formatted', citation_data.get('url', ''))}")
+                    lines.append(f"**[{i}]** {citation_data.get('formatted', citation_data.get('url', ''))}")
                 else:
-                    st.markdown(f"**[{i}]** {citation_data}")
+                    lines.append(f"**[{i}]** {citation_data}")
+            st.markdown("\n\n".join(lines))
 
     # Display metadata
-    metadata = result.get("metadata", {})
-
     col1, col2 = st.columns(2)
     with col1:
         st.metric("Sources Used", metadata.get("num_sources", 0))
@@ -350,6 +434,21 @@ def display_response(result: Dict[str, Any]):
             display_agent_traces(agent_traces)
 
 
+@st.fragment
+def display_response_fragment():
+    """
+    Display the latest query response (st.session_state.last_result) as a
+    fragment, so interactions inside it rerun only the response rather than
+    the whole app.
+    """
+    display_response(st.session_state.last_result)
+
+
+def show_more_traces():
+    """Reveal another page of earlier agent trace steps."""
+    st.session_state.trace_offset += _TRACE_PAGE
+
+
 def display_agent_traces(traces: list):
     """
     Display agent execution traces with step-by-step workflow.
@@ -358,29 +457,27 @@ def display_agent_traces(traces: list):
         st.markdown("**Agent Workflow (Step-by-Step)**")
         st.markdown("---")
         
-        for trace in traces:
+        # Only the latest steps are rendered; earlier ones a page at a time
+        shown = st.session_state.setdefault("trace_offset", _TRACE_PAGE)
+        hidden = max(len(traces) - shown, 0)
+        if hidden:
+            st.button(
+                f"Show earlier steps ({hidden} hidden)",
+                on_click=show_more_traces
+            )
+        
+        for trace in traces[hidden:]:
             step = trace.get("step", 0)
             agent = trace.get("agent", "Unknown")
-            preview = trace.get("preview", "")
+            content = trace.get("full_content", "")
+            preview = content[:300] + "..." if len(content) > 300 else content
             
             # Color code by agent
-            agent_emoji = {
-                "Planner": "📋",
-                "Researcher": "🔍",
-                "Writer": "✍️",
-                "Critic": "⚖️"
-            }
-            emoji = agent_emoji.get(agent, "💬")
+            emoji = _AGENT_EMOJI.get(agent, "💬")
             
             st.markdown(f"### {emoji} Step {step}: {agent}")
-            with st.container():
-                st.text_area(
-                    f"Message from {agent}",
-                    preview,
-                    height=150,
-                    key=f"trace_{step}",
-                    disabled=True
-                )
+            # Read-only, so a plain code block rather than a disabled text_area
+            st.code(preview, language=None)
             st.markdown("---")
 
 
@@ -414,28 +511,45 @@ def display_sidebar():
         # Clear history button
         if st.button("Clear History"):
             st.session_state.history = []
+            st.session_state.last_result = None
             st.rerun()
 
         # About section
         st.divider()
         st.markdown("### About")
-        config = load_config()
-        system_name = config.get("system", {}).get("name", "Research Assistant")
-        topic = config.get("system", {}).get("topic", "General")
-        st.markdown(f"**System:** {system_name}")
-        st.markdown(f"**Topic:** {topic}")
+        st.markdown(f"**System:** {st.session_state.system_name}")
+        st.markdown(f"**Topic:** {st.session_state.topic}")
+
+
+def show_more_history():
+    """Show another page of older queries in the history."""
+    st.session_state.history_limit += _HISTORY_PAGE
 
 
+@st.fragment
 def display_history():
-    """Display query history."""
-    if not st.session_state.history:
+    """Display query history (the most recent queries, oldest first)."""
+    history = st.session_state.history
+    if not history:
         return
 
     with st.expander("📜 Query History", expanded=False):
-        for i, item in enumerate(reversed(st.session_state.history), 1):
+        # history is newest first; only the latest history_limit are rendered
+        limit = st.session_state.setdefault("history_limit", _HISTORY_PAGE)
+        items = history[:limit]
+        hidden = len(history) - len(items)
+        if hidden:
+            st.button(
+                f"Show earlier queries ({hidden} hidden)",
+                on_click=show_more_history
+            )
+        # One markdown element for the whole list
+        lines = []
+        for i, item in enumerate(reversed(items), hidden + 1):
             timestamp = item.get("timestamp", "")
             query = item.get("query", "")
-            st.markdown(f"**{i}.** [{timestamp}] {query}")
+            lines.append(f"**{i}.** [{timestamp}] {query}")
+        st.markdown("\n\n".join(lines))
 
 
 def main():
@@ -459,15 +573,18 @@ def main():
     col1, col2 = st.columns([2, 1])
 
     with col1:
-        # Query input
-        query = st.text_area(
-            "Enter your research query:",
-            height=100,
-            placeholder="e.g., What are the latest developments in explainable AI for novice users?"
-        )
-
-        # Submit button
-        if st.button("🔍 Search", type="primary", use_container_width=True):
+        # Query input; in a form so the app only reruns when it is submitted
+        with st.form("query_form", clear_on_submit=False):
+            query = st.text_area(
+                "Enter your research query:",
+                height=100,
+                placeholder="e.g., What are the latest developments in explainable AI for novice users?"
+            )
+
+            # Submit button
+            submitted = st.form_submit_button("🔍 Search", type="primary", use_container_width=True)
+
+        if submitted:
             if query.strip():
                 # Create status placeholder for real-time agent updates
                 status_container = st.empty()
@@ -489,12 +606,17 @@ def main():
                     "result": result
                 })
 
-                # Display result
-                st.divider()
-                display_response(result)
+                # Kept for display on later reruns (e.g. settings toggles)
+                st.session_state.last_result = result
+                st.session_state.trace_offset = _TRACE_PAGE
             else:
                 st.warning("Please enter a query.")
 
+        # Display the latest result
+        if st.session_state.get("last_result") is not None:
+            st.divider()
+            display_response_fragment()
+
         # History
         display_history()
 
@@ -0,0 +1,41 @@
+"""Tests for OutputGuardrail.validate_stream."""
+
+from src.guardrails.output_guardrail import OutputGuardrail
+
+
+def _pii_matches(events):
+    """All PII matches reported over a validate_stream run."""
+    return [
+        match
+        for _, violations in events
+        for violation in violations
+        if violation["validator"] == "pii"
+        for match in violation["matches"]
+    ]
+
+
+def test_email_split_across_chunks_is_reported_once():
+    guardrail = OutputGuardrail({})
+    chunks = ["Contact jane.doe@example.co", "m for details."]
+
+    events = list(guardrail.validate_stream(chunks))
+
+    assert _pii_matches(events) == ["jane.doe@example.com"]
+    assert [chunk for chunk, _ in events] == chunks
+
+
+def test_email_at_end_of_stream_is_reported():
+    guardrail = OutputGuardrail({})
+
+    events = list(guardrail.validate_stream(["Contact ", "jane.doe@example.com"]))
+
+    assert _pii_matches(events) == ["jane.doe@example.com"]
+    assert events[-1][0] == ""
+
+
+def test_email_continuing_after_separator_is_reported_once():
+    guardrail = OutputGuardrail({})
+
+    events = list(guardrail.validate_stream(["Email bob@ex.co.", "uk today"]))
+
+    assert _pii_matches(events) == ["bob@ex.co.uk"]